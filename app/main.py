@@ -8,15 +8,23 @@ Security:
 - Auto-sync on startup if no cache
 """
 
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
 from contextlib import asynccontextmanager
+import asyncio
+import functools
+import json
 import os
 import logging
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster response serialization
+except ImportError:
+    orjson = None
+
 from .validator import VocabValidator
 from .sync import CurriculumSync
 from .recommender import ContentRecommender
@@ -77,6 +85,22 @@ recommender = ContentRecommender(data_dir=DATA_DIR)
 # Lifespan (startup/shutdown)
 # ═══════════════════════════════════════════════════════════
 
+def _log_jieba_warmup(task: asyncio.Task):
+    """Surface background jieba warmup failures (requests retry the init)"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"jieba warmup failed: {task.exception()}")
+
+
+async def _ensure_jieba():
+    """
+    Finish adding curriculum words to jieba in a worker thread, so handlers
+    that segment on the event loop never block on the validator's init lock
+    (while the startup warmup or another request is still building it).
+    """
+    if not validator.jieba_ready:
+        await asyncio.to_thread(validator.init_jieba)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
@@ -89,6 +113,11 @@ async def lifespan(app: FastAPI):
     try:
         validator.load()
         logger.info(f"✓ Curriculum loaded: {validator.get_curriculum_info()['word_count']} words")
+        # Warm jieba in the background so startup isn't blocked by its dictionary
+        # build; requests that arrive first wait for it off the event loop
+        # (see _ensure_jieba). Kept on app.state so it's awaited at shutdown.
+        app.state.jieba_warmup = asyncio.create_task(asyncio.to_thread(validator.init_jieba))
+        app.state.jieba_warmup.add_done_callback(_log_jieba_warmup)
     except FileNotFoundError:
         logger.warning("No curriculum cache found - attempting auto-sync...")
         try:
@@ -130,6 +159,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down vocab-validator")
+    jieba_warmup = getattr(app.state, "jieba_warmup", None)
+    if jieba_warmup is not None and not jieba_warmup.done():
+        # The worker thread can't be interrupted; let it finish (failures are logged)
+        await asyncio.gather(jieba_warmup, return_exceptions=True)
 
 
 app = FastAPI(
@@ -197,6 +230,16 @@ class ValidateResponse(BaseModel):
     stats: dict
 
 
+class ValidateBatchRequest(BaseModel):
+    texts: list[str]
+    user_position: UserPosition
+    target_words: list[str] = []
+
+
+class ValidateBatchResponse(BaseModel):
+    results: list[ValidateResponse]
+
+
 # ═══════════════════════════════════════════════════════════
 # i+1 Lesson Validation Models
 # ═══════════════════════════════════════════════════════════
@@ -260,6 +303,22 @@ async def health_check():
     )
 
 
+@functools.lru_cache(maxsize=1024)
+def _validate_response_bytes(
+    text: str, hsk: int, lesson: int, target_key: tuple[str, ...], cache_epoch: int
+) -> bytes:
+    """
+    Serialized /validate response, cached so repeated texts skip validation,
+    model building and JSON encoding. cache_epoch (bumped by the validator on
+    reload) keeps stale entries from ever being served.
+    """
+    result = validator.validate(text, hsk, lesson, list(target_key))
+    body = ValidateResponse(**result).model_dump()
+    if orjson:
+        return orjson.dumps(body)
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 @app.post("/validate", response_model=ValidateResponse)
 async def validate_text(request: ValidateRequest):
     """
@@ -278,15 +337,47 @@ async def validate_text(request: ValidateRequest):
         )
     
     try:
-        result = validator.validate(
-            text=request.text,
+        await _ensure_jieba()
+        content = _validate_response_bytes(
+            request.text,
+            request.user_position.hsk,
+            request.user_position.lesson,
+            tuple(sorted(set(request.target_words))),
+            validator.cache_epoch
+        )
+        return Response(content=content, media_type="application/json")
+    except Exception as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/validate/batch", response_model=ValidateBatchResponse)
+async def validate_batch(request: ValidateBatchRequest):
+    """
+    Validate many texts (e.g. subtitle lines) at one curriculum position.
+    
+    Same rules as /validate; results are returned in request order.
+    Runs in a worker thread so a large batch doesn't block the event loop.
+    """
+    if not validator.loaded:
+        raise HTTPException(
+            status_code=503, 
+            detail="Curriculum not loaded. POST /sync to initialize."
+        )
+    
+    try:
+        results = await asyncio.to_thread(
+            validator.validate_batch,
+            texts=request.texts,
             user_hsk=request.user_position.hsk,
             user_lesson=request.user_position.lesson,
             target_words=request.target_words
         )
-        return ValidateResponse(**result)
+        return ValidateBatchResponse(
+            results=[ValidateResponse(**result) for result in results]
+        )
     except Exception as e:
-        logger.error(f"Validation error: {e}")
+        logger.error(f"Batch validation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -314,6 +405,7 @@ async def validate_lesson(request: ValidateLessonRequest):
         )
     
     try:
+        await _ensure_jieba()
         result = validator.validate_lesson(
             text=request.text,
             lesson_number=request.lesson_number,
@@ -350,6 +442,7 @@ async def validate_reading_structured(request: ValidateReadingRequest):
         )
     
     try:
+        await _ensure_jieba()
         result = validator.validate_reading_structured(
             chinese_text=request.reading.chinese,
             user_lesson_position=request.user_lesson_position,
@@ -384,7 +477,9 @@ async def validate_structure(request: ValidateStructureRequest):
         )
     
     try:
-        result = validator.validate_exercise_structure(
+        # Whole-lesson validation is CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(
+            validator.validate_exercise_structure,
             exercises=request.exercises,
             allowed_words=request.allowed_words
         )
@@ -414,7 +509,9 @@ async def validate_pedagogy(request: ValidatePedagogyRequest):
         )
     
     try:
-        result = validator.validate_pedagogy(
+        # Whole-lesson validation is CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(
+            validator.validate_pedagogy,
             reading_chinese=request.reading.chinese,
             exercises=request.exercises,
             user_lesson_position=request.user_lesson_position,
@@ -589,6 +686,7 @@ async def segment_text(request: SegmentRequest):
             detail="Curriculum not loaded. POST /sync to initialize."
         )
     
+    await _ensure_jieba()
     all_words = set()
     always_safe_removed = set()
     segments = []
@@ -644,16 +742,14 @@ async def seed_test_curriculum(request: SeedTestCurriculumRequest):
     Accepts a dict of {word: position} and loads it directly
     into the validator without persisting to disk.
     """
-    import jieba
-    
     # Load directly into validator memory
     validator.curriculum = request.words
     validator.version = "test-seed"
     validator.loaded = True
     
     # Add all words to jieba for proper segmentation
-    for word in validator.curriculum.keys():
-        jieba.add_word(word, freq=1000)
+    validator.register_words(validator.curriculum.keys(), freq=1000)
+    validator.rebuild_index()
     
     logger.info(f"Test curriculum seeded: {len(request.words)} words")
     
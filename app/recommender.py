@@ -12,9 +12,14 @@ This ensures consistency (single source of truth for tokenization).
 import json
 import os
 import logging
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, FrozenSet, List, Tuple, Optional
 from datetime import datetime
 
+try:
+    import orjson  # Optional: much faster parsing of the (large) content export
+except ImportError:
+    orjson = None
+
 from .models import (
     TierName, TIER_CONFIG,
     ContentItem, UnknownWord, TierResult, RecommendResponse,
@@ -35,8 +40,8 @@ class ContentRecommender:
         self.lesson_order: List[str] = []
         self.lesson_word_map: Dict[str, List[str]] = {}  # lesson_id -> vocab_ids
         
-        # Cumulative word sets per lesson (computed once)
-        self.cumulative_words: Dict[str, Set[str]] = {}  # lesson_id -> set of vocab_ids
+        # Cumulative word sets per lesson (computed once, shared read-only)
+        self.cumulative_words: Dict[str, FrozenSet[str]] = {}  # lesson_id -> set of vocab_ids
         
         # Content with pre-tokenized words
         self.stories: List[Dict] = []  # Story with tokenized words
@@ -52,8 +57,9 @@ class ContentRecommender:
             logger.warning("Content cache not found - recommender unavailable")
             return
         
-        with open(content_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(content_path, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
         
         # Load vocabulary (for lookup and preview)
         for v in data.get("vocabulary", []):
@@ -79,7 +85,8 @@ class ContentRecommender:
                 "difficulty": story.get("difficulty", "medium"),
                 "tokens": tokens,
                 "totalTokens": story.get("totalTokens", len(tokens)),
-                "type": "story"
+                "type": "story",
+                **self._index_tokens(tokens)
             })
         
         # Load audiobooks (PRE-TOKENIZED by backend)
@@ -93,7 +100,8 @@ class ContentRecommender:
                     "hskLevel": ab["hskLevel"],
                     "tokens": tokens,
                     "totalTokens": ab.get("totalTokens", len(tokens)),
-                    "type": "audiobook"
+                    "type": "audiobook",
+                    **self._index_tokens(tokens)
                 })
         
         self.version = data.get("version", "")
@@ -112,65 +120,68 @@ class ContentRecommender:
     def _build_cumulative_words(self):
         """Build cumulative word sets for each lesson position."""
         self.cumulative_words = {}
-        known_so_far: Set[str] = set()
+        known_so_far: FrozenSet[str] = frozenset()
         
         for lesson_id in self.lesson_order:
-            new_words = set(self.lesson_word_map.get(lesson_id, []))
-            known_so_far = known_so_far | new_words
-            self.cumulative_words[lesson_id] = known_so_far.copy()
+            # Each union is a new frozenset, so lessons never share a mutable set
+            known_so_far = known_so_far.union(self.lesson_word_map.get(lesson_id, []))
+            self.cumulative_words[lesson_id] = known_so_far
         
         logger.info(f"Built cumulative word sets for {len(self.cumulative_words)} lessons")
     
-    def _calculate_comprehension(
-        self, 
-        tokens: List[Dict], 
-        known_word_ids: Set[str]
-    ) -> Tuple[float, List[Dict], int]:
+    @staticmethod
+    def _index_tokens(tokens: List[Dict]) -> Dict:
         """
-        Calculate token-level comprehension.
+        Precompute what scoring needs from a content item's tokens (once, at load).
         
         Tokens are pre-tokenized by backend: [{"wordId": "...", "hanzi": "..."}, ...]
+        (dicts or objects with the same attributes); only tokens with a wordId
+        are curriculum tokens.
+        
+        - wordIds: curriculum word id of every curriculum token, in order
+        - wordHanzi: word id -> hanzi of its first occurrence, in first-seen order
+        """
+        word_ids = []
+        word_hanzi = {}
+        for t in tokens:
+            if isinstance(t, dict):
+                word_id = t.get("wordId")
+                hanzi = t.get("hanzi", "")
+            else:
+                word_id = getattr(t, "wordId", None)
+                hanzi = getattr(t, "hanzi", "")
+            if word_id is not None:
+                word_ids.append(word_id)
+                word_hanzi.setdefault(word_id, hanzi)
+        return {"wordIds": tuple(word_ids), "wordHanzi": word_hanzi}
+    
+    def _score_item(
+        self,
+        item: Dict,
+        known_word_ids: FrozenSet[str]
+    ) -> Tuple[float, List[Dict], int]:
+        """
+        Calculate token-level comprehension from an item's load-time index
+        (see _index_tokens).
         
         Returns:
         - comprehension: float (0.0 - 1.0)
         - unknown_words: list of unique unknown words (as dicts)
         - unknown_count: total unique unknown words
         """
-        # Handle both dict and object formats
-        def get_word_id(t):
-            if isinstance(t, dict):
-                return t.get("wordId")
-            return getattr(t, "wordId", None)
-        
-        def get_hanzi(t):
-            if isinstance(t, dict):
-                return t.get("hanzi", "")
-            return getattr(t, "hanzi", "")
-        
-        # Only count curriculum tokens (those with wordId)
-        curriculum_tokens = [t for t in tokens if get_word_id(t) is not None]
-        
-        if not curriculum_tokens:
+        word_ids = item["wordIds"]
+        if not word_ids:
             return 1.0, [], 0
         
-        known_count = sum(1 for t in curriculum_tokens if get_word_id(t) in known_word_ids)
-        comprehension = known_count / len(curriculum_tokens)
-        
-        # Get unique unknown words
-        unknown_ids = set()
-        unknown_words = []
-        for t in curriculum_tokens:
-            word_id = get_word_id(t)
-            if word_id not in known_word_ids and word_id not in unknown_ids:
-                unknown_ids.add(word_id)
-                unknown_words.append({
-                    "wordId": word_id,
-                    "hanzi": get_hanzi(t)
-                })
-        
-        return comprehension, unknown_words, len(unknown_words)
+        known_count = sum(1 for w in word_ids if w in known_word_ids)
+        unknown_words = [
+            {"wordId": w, "hanzi": hanzi}
+            for w, hanzi in item["wordHanzi"].items()
+            if w not in known_word_ids
+        ]
+        return known_count / len(word_ids), unknown_words, len(unknown_words)
     
-    def get_known_words_for_lesson(self, lesson_id: str) -> Set[str]:
+    def get_known_words_for_lesson(self, lesson_id: str) -> FrozenSet[str]:
         """Get all word IDs known at a specific lesson position."""
         if lesson_id in self.cumulative_words:
             return self.cumulative_words[lesson_id]
@@ -178,7 +189,7 @@ class ContentRecommender:
         # If lesson_id not found, try to find closest match
         # (user might be at a lesson we don't have)
         logger.warning(f"Lesson ID not found: {lesson_id}")
-        return set()
+        return frozenset()
     
     def recommend(
         self,
@@ -204,9 +215,7 @@ class ContentRecommender:
         
         if content_type in ("story", "all"):
             for story in self.stories:
-                comp, unknown, unknown_count = self._calculate_comprehension(
-                    story["tokens"], known_word_ids
-                )
+                comp, unknown, unknown_count = self._score_item(story, known_word_ids)
                 all_content.append({
                     "type": "story",
                     "id": story["id"],
@@ -220,9 +229,7 @@ class ContentRecommender:
         
         if content_type in ("audiobook", "all"):
             for ab in self.audiobooks:
-                comp, unknown, unknown_count = self._calculate_comprehension(
-                    ab["tokens"], known_word_ids
-                )
+                comp, unknown, unknown_count = self._score_item(ab, known_word_ids)
                 all_content.append({
                     "type": "audiobook",
                     "id": ab["id"],
@@ -8,8 +8,10 @@ Design:
 - Store curriculum as JSON for fast loading (curriculum.json for validator)
 - Store full content as JSON for recommender (content.json)
 - Retry on network failures with exponential backoff
+- Disk I/O runs in a worker thread so sync never blocks the event loop
 """
 
+import asyncio
 import json
 import os
 import httpx
@@ -23,9 +25,20 @@ from tenacity import (
     before_sleep_log
 )
 
+try:
+    import orjson  # Optional: faster serialization of large exports
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+async def _raise_on_error(response: httpx.Response):
+    """Response hook: only build an HTTPStatusError for non-2xx responses"""
+    if not response.is_success:
+        response.raise_for_status()
+
+
 class CurriculumSync:
     def __init__(self, backend_url: str, data_dir: str = "./data"):
         self.backend_url = backend_url.rstrip("/")
@@ -35,6 +48,13 @@ class CurriculumSync:
         # Ensure data directory exists
         os.makedirs(data_dir, exist_ok=True)
     
+    def _client(self) -> httpx.AsyncClient:
+        """HTTP client with the status check applied once per response"""
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            event_hooks={"response": [_raise_on_error]}
+        )
+    
     def _get_local_version(self) -> str:
         """Get locally stored version hash"""
         version_path = os.path.join(self.data_dir, "version.txt")
@@ -49,17 +69,22 @@ class CurriculumSync:
         with open(version_path, "w") as f:
             f.write(version)
     
+    def _write_json(self, path: str, data: dict):
+        """Write JSON as UTF-8 (orjson when available, same layout as json.dump)"""
+        if orjson:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+    
     def _save_curriculum(self, data: dict):
         """Save curriculum data locally (for validator)"""
-        curriculum_path = os.path.join(self.data_dir, "curriculum.json")
-        with open(curriculum_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(os.path.join(self.data_dir, "curriculum.json"), data)
     
     def _save_content(self, data: dict):
         """Save full content data locally (for recommender)"""
-        content_path = os.path.join(self.data_dir, "content.json")
-        with open(content_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(os.path.join(self.data_dir, "content.json"), data)
     
     def _get_content_version(self) -> str:
         """Get locally stored content version"""
@@ -86,14 +111,13 @@ class CurriculumSync:
         Check if backend has newer version.
         Retries up to 3 times on network errors.
         """
-        local_version = self._get_local_version()
+        local_version = await asyncio.to_thread(self._get_local_version)
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.backend_url}/v1/curriculum/version",
                 headers={"X-Local-Version": local_version}
             )
-            response.raise_for_status()
             return response.json()
     
     @retry(
@@ -108,12 +132,11 @@ class CurriculumSync:
         First tries vocab-export (all vocabulary), falls back to export (lesson-derived).
         Retries up to 3 times on network errors.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             # Try vocab-export first (all vocabulary)
             response = await client.get(
                 f"{self.backend_url}/v1/curriculum/vocab-export"
             )
-            response.raise_for_status()
             data = response.json()
             
             # If vocab-export is empty, try the lesson-derived export
@@ -122,7 +145,6 @@ class CurriculumSync:
                 response = await client.get(
                     f"{self.backend_url}/v1/curriculum/export"
                 )
-                response.raise_for_status()
                 data = response.json()
             
             return data
@@ -135,11 +157,10 @@ class CurriculumSync:
     )
     async def check_full_export_version(self) -> dict:
         """Check version of full export (for recommender)."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.backend_url}/v1/curriculum/full-export/version"
             )
-            response.raise_for_status()
             return response.json()
     
     @retry(
@@ -153,11 +174,10 @@ class CurriculumSync:
         Fetch full export from backend (for recommender).
         Includes vocabulary, lessons, stories, audiobooks.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.backend_url}/v1/curriculum/full-export"
             )
-            response.raise_for_status()
             return response.json()
     
     async def sync(self) -> dict:
@@ -191,9 +211,9 @@ class CurriculumSync:
             logger.info("Downloading curriculum update...")
             curriculum = await self.fetch_curriculum()
             
-            # Save locally
-            self._save_curriculum(curriculum)
-            self._save_version(curriculum.get("version", ""))
+            # Save locally (off the event loop - large JSON writes block)
+            await asyncio.to_thread(self._save_curriculum, curriculum)
+            await asyncio.to_thread(self._save_version, curriculum.get("version", ""))
             
             word_count = len(curriculum.get("words", {}))
             logger.info(f"Curriculum saved: {word_count} words")
@@ -232,7 +252,7 @@ class CurriculumSync:
         try:
             # Check version first
             logger.info(f"Checking full export version at {self.backend_url}")
-            local_version = self._get_content_version()
+            local_version = await asyncio.to_thread(self._get_content_version)
             version_info = await self.check_full_export_version()
             remote_version = version_info.get("version", "")
             
@@ -252,9 +272,9 @@ class CurriculumSync:
             logger.info("Downloading full content export...")
             content = await self.fetch_full_export()
             
-            # Save locally
-            self._save_content(content)
-            self._save_content_version(content.get("version", ""))
+            # Save locally (off the event loop - full export is tens of MB)
+            await asyncio.to_thread(self._save_content, content)
+            await asyncio.to_thread(self._save_content_version, content.get("version", ""))
             
             vocab_count = len(content.get("vocabulary", []))
             lesson_count = len(content.get("lessons", []))
@@ -8,31 +8,215 @@ Design:
 - Flip logic: whitelist for early learners, blacklist for advanced
 """
 
+import functools
 import json
 import os
-import jieba
+import re
+import sys
+import threading
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain
 from typing import Optional
 
+try:
+    import jieba_fast as jieba  # Optional: C-accelerated, API-compatible jieba
+except ImportError:
+    import jieba
+
+try:
+    import orjson  # Optional: ~2-3x faster curriculum parsing
+except ImportError:
+    orjson = None
+
+
+# Chinese + ASCII punctuation and whitespace (tokens made only of these are dropped),
+# plus every BMP punctuation (P*), separator (Z*) and control/format (Cc, Cf) char
+_PUNCTUATION = frozenset("，。！？、；：“”‘’（）【】《》…—·,.!?;:\"'()[]<>-_ \n\t").union(
+    c for c in map(chr, range(0x10000))
+    if unicodedata.category(c)[0] in "PZ" or unicodedata.category(c) in ("Cc", "Cf")
+)
+
+# Compiled once: a C-level character class instead of a per-token Python check
+_PUNCTUATION_RE = re.compile(
+    "[" + "".join(re.escape(c) for c in sorted(_PUNCTUATION)) + "]+"
+)
+# Longest text _segment checks for the no-jieba shortcut (one character plus punctuation)
+_TRIVIAL_TEXT_MAX_LEN = 8
+# Bound once: skips the attribute lookup per token in the segment filter
+_punctuation_match = _PUNCTUATION_RE.fullmatch
+
+
+def _is_punctuation_token(w: str) -> bool:
+    """Punctuation-only token? Most tokens are rejected by one set probe on w[0]."""
+    return w[0] in _PUNCTUATION and (len(w) == 1 or _punctuation_match(w) is not None)
+
+
+# Common function words that are always allowed
+# (pronouns, particles, basic connectors)
+_ALWAYS_SAFE = frozenset({
+    "我", "你", "他", "她", "它", "我们", "你们", "他们",
+    "的", "了", "吗", "呢", "吧", "啊", "哦", "嗯",
+    "是", "有", "在", "和", "与", "或", "但", "而",
+    "这", "那", "什么", "怎么", "为什么", "哪", "哪里",
+    "很", "太", "最", "都", "也", "还", "就", "才",
+    "不", "没", "别", "请", "要", "会", "能", "可以",
+    "一", "二", "三", "四", "五", "六", "七", "八", "九", "十",
+    "个", "些", "点", "下", "上", "里", "外",
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_position(position_str: str) -> tuple[int, int]:
+    """Parse 'hsk1-l3' to (1, 3); (0, 0) if invalid. Few distinct inputs, so cached."""
+    try:
+        parts = position_str.replace("hsk", "").split("-l")
+        return int(parts[0]), int(parts[1])
+    except:
+        return 0, 0
+
+
+# Words already registered with the (process-global) jieba dictionary
+_jieba_words: set[str] = set()
+
+class _ReadWriteLock:
+    """Any number of concurrent readers or one writer; a waiting writer blocks new readers"""
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writers = 0  # waiting or active
+        self._writing = False
+    
+    @contextmanager
+    def reading(self):
+        with self._cond:
+            while self._writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def writing(self):
+        with self._cond:
+            self._writers += 1
+            while self._readers or self._writing:
+                self._cond.wait()
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._writers -= 1
+                self._cond.notify_all()
+
+
+# jieba's dictionary is global and not safe to mutate while another thread
+# is cutting (endpoints segment in worker threads while /sync reloads).
+# Cuts only read it, so they run side by side and never wait on each other
+# (a long worker-thread cut doesn't stall one on the event loop); only
+# dictionary writes are exclusive.
+_jieba_lock = _ReadWriteLock()
+
+# Bumped after every change to jieba's dictionary; part of the _segment key
+_jieba_generation = 0
+
+
+def _add_jieba_words(words: list[str], freq: Optional[int] = None):
+    """Add words to jieba's dictionary in one locked batch and bump the generation"""
+    global _jieba_generation
+    with _jieba_lock.writing():
+        for word in words:
+            jieba.add_word(word, freq=freq)
+        _jieba_words.update(words)
+        _jieba_generation += 1
+
+
+@functools.lru_cache(maxsize=4096)
+def _segment(text: str, generation: int) -> tuple[str, ...]:
+    """
+    Segment text with jieba and drop punctuation/whitespace tokens.
+    
+    Cached process-wide: the jieba dictionary is global, so results only
+    change when words are added to it. generation is the _jieba_generation
+    the caller read before calling: a cut that raced a dictionary change is
+    stored under the old generation and never served again.
+    Returns a tuple so cached results can't be mutated by callers.
+    
+    Short inputs with at most one non-punctuation character skip jieba: the
+    result is known without building a DAG. Longer texts are almost never
+    trivial, so they go straight to jieba without a stripping pass.
+    """
+    if len(text) <= _TRIVIAL_TEXT_MAX_LEN:
+        core = _PUNCTUATION_RE.sub("", text)
+        if len(core) <= 1:
+            return (core,) if core else ()
+    
+    with _jieba_lock.reading():
+        return tuple(w for w in jieba.cut(text) if w and not _is_punctuation_token(w))
+
 
 class VocabValidator:
+    # Common function words that are always allowed (shared, immutable)
+    always_safe = _ALWAYS_SAFE
+    
     def __init__(self, data_dir: str = "./data"):
         self.data_dir = data_dir
         self.curriculum: dict = {}
+        self.curriculum_pos: dict[str, tuple[int, int]] = {}  # word -> (hsk, lesson)
+        self.curriculum_abs: dict[str, int] = {}  # word -> absolute lesson ID
+        self.known_words: frozenset[str] = _ALWAYS_SAFE  # curriculum words + always_safe
         self.version: str = ""
         self.loaded: bool = False
-        
-        # Common function words that are always allowed
-        # (pronouns, particles, basic connectors)
-        self.always_safe = {
-            "我", "你", "他", "她", "它", "我们", "你们", "他们",
-            "的", "了", "吗", "呢", "吧", "啊", "哦", "嗯",
-            "是", "有", "在", "和", "与", "或", "但", "而",
-            "这", "那", "什么", "怎么", "为什么", "哪", "哪里",
-            "很", "太", "最", "都", "也", "还", "就", "才",
-            "不", "没", "别", "请", "要", "会", "能", "可以",
-            "一", "二", "三", "四", "五", "六", "七", "八", "九", "十",
-            "个", "些", "点", "下", "上", "里", "外",
+        self.cache_epoch: int = 0  # bumped whenever cached results go stale
+        
+        # Curriculum words not yet added to jieba (deferred from load)
+        self._pending_words: list[str] = []
+        self._jieba_init_lock = threading.Lock()
+        
+        # Per exercise type: (fields, pedagogy_fields, check)
+        # - fields(ex): (field_path, chinese) pairs that must use allowed words
+        # - pedagogy_fields: field paths scored by validate_pedagogy (None = all)
+        # - check(ex, ex_id, errors, warnings): type-specific structure rules
+        self._exercise_types = {
+            "multiple_choice": (self._mcq_fields, None, self._check_correct_option),
+            "drag_sentence": (
+                self._drag_fields, frozenset({"targetSentence.chinese"}), self._check_drag_positions
+            ),
+            "spot_error": (self._spot_error_fields, None, self._check_error_word),
+            "build_sentence": (
+                self._build_fields, frozenset({"expectedAnswer.chinese"}), None
+            ),
+            "read_comp": (
+                self._read_comp_fields,
+                frozenset({"passage.chinese", "question.chinese"}),
+                self._check_correct_option
+            ),
         }
+        
+        # Memoized learning segmentation: depends only on text + curriculum,
+        # so it is shared across user positions, target words and endpoints.
+        # This cache and the classification cache below take cache_epoch as
+        # their last argument: callers read it before computing, so a result
+        # computed from data a concurrent reload replaced lands under the old
+        # epoch and is never served again.
+        self._learning_words_cached = functools.lru_cache(maxsize=4096)(
+            self._segment_for_learning
+        )
+        
+        # Memoized curriculum classification shared by the reading and
+        # pedagogy checks (the same reading is usually validated by both)
+        self._classify_words_cached = functools.lru_cache(maxsize=256)(
+            self._classify_words
+        )
     
     def _split_for_learning(self, words: list[str]) -> list[str]:
         """
@@ -44,7 +228,7 @@ class VocabValidator:
         treating common phrases as single units.
         """
         result = []
-        all_known = self.curriculum.keys() | self.always_safe
+        all_known = self.known_words  # precomputed in rebuild_index
         
         for word in words:
             if len(word) <= 1:
@@ -78,31 +262,119 @@ class VocabValidator:
         return result
     
     def load(self):
-        """Load curriculum from local cache"""
+        """
+        Load curriculum from local cache.
+        
+        No-op if already loaded and version.txt still names the loaded
+        version (e.g. reload after a sync that found nothing new).
+        """
         curriculum_path = os.path.join(self.data_dir, "curriculum.json")
         version_path = os.path.join(self.data_dir, "version.txt")
         
         if not os.path.exists(curriculum_path):
             raise FileNotFoundError(f"Curriculum not found at {curriculum_path}")
         
-        with open(curriculum_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            self.curriculum = data.get("words", {})
-        
+        version = None
         if os.path.exists(version_path):
             with open(version_path, "r") as f:
-                self.version = f.read().strip()
+                version = f.read().strip()
+        
+        if self.loaded and version and version == self.version:
+            return
+        
+        with open(curriculum_path, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        # Only a few dozen distinct positions: share one string per position
+        # instead of holding a separate copy for every word
+        self.curriculum = {
+            word: sys.intern(position) if isinstance(position, str) else position
+            for word, position in data.get("words", {}).items()
+        }
+        
+        if version is not None:
+            self.version = version
         
         self.loaded = True
         
-        # Add curriculum words to jieba dictionary for better segmentation
-        for word in self.curriculum.keys():
-            jieba.add_word(word)
+        # Curriculum words are added to jieba lazily (see init_jieba), so
+        # startup doesn't pay for jieba's dictionary build. Only new words:
+        # add_word runs a trial cut per word, and re-adding on every reload
+        # would also keep inflating jieba's total frequency. Assigned under
+        # the init lock so an in-flight init_jieba can't drop the new list.
+        with self._jieba_init_lock:
+            self._pending_words = [w for w in self.curriculum if w not in _jieba_words]
+        
+        self.rebuild_index()
+    
+    def init_jieba(self):
+        """Add pending curriculum words to jieba (runs once per load, before segmenting)"""
+        if not self._pending_words:
+            return
+        with self._jieba_init_lock:
+            # Re-check: another thread may have finished while we waited
+            pending = self._pending_words
+            if pending:
+                _add_jieba_words(pending)
+                # Only clear the list we registered, never one a reload swapped in
+                if self._pending_words is pending:
+                    self._pending_words = []
+    
+    @property
+    def jieba_ready(self) -> bool:
+        """True once every loaded curriculum word has been added to jieba"""
+        return not self._pending_words
+    
+    def register_words(self, words, freq: Optional[int] = None):
+        """Add words to the jieba dictionary in one locked batch"""
+        _add_jieba_words(list(words), freq)
+        # Explicitly registered words (e.g. with a custom freq) aren't re-added lazily
+        with self._jieba_init_lock:
+            if self._pending_words:
+                self._pending_words = [w for w in self._pending_words if w not in _jieba_words]
     
     def reload(self):
         """Reload curriculum after sync"""
         self.load()
     
+    def rebuild_index(self):
+        """
+        Precompute lookup tables from self.curriculum.
+        
+        Must be called whenever self.curriculum is replaced (load, test seeding).
+        
+        Positions are kept as (hsk, lesson) tuples, which compare in
+        curriculum order for any lesson number.
+        
+        Absolute lesson IDs:
+        HSK1 lessons 1-10 = IDs 1-10
+        HSK2 lessons 1-10 = IDs 11-20
+        etc.
+        """
+        curriculum_pos = {}
+        curriculum_abs = {}
+        shared = {}  # (hsk, lesson) -> absolute ID: one tuple and int object per position
+        for word, position in self.curriculum.items():
+            parsed = self._parse_position(position)  # cached per position
+            absolute = shared.get(parsed)
+            if absolute is None:
+                word_hsk, word_lesson = parsed
+                absolute = shared[parsed] = (word_hsk - 1) * 10 + word_lesson
+            curriculum_pos[word] = parsed
+            curriculum_abs[word] = absolute
+        self.curriculum_pos = curriculum_pos
+        self.curriculum_abs = curriculum_abs
+        self.known_words = frozenset(curriculum_abs).union(self.always_safe)
+        
+        self.clear_caches()
+    
+    def clear_caches(self):
+        """Drop memoized results (call whenever curriculum or jieba dict changes)"""
+        self.cache_epoch += 1
+        self._learning_words_cached.cache_clear()
+        self._classify_words_cached.cache_clear()
+        _segment.cache_clear()
+    
     def get_curriculum_info(self) -> dict:
         """Get current curriculum info"""
         return {
@@ -114,9 +386,9 @@ class VocabValidator:
     def _parse_position(self, position_str: str) -> tuple[int, int]:
         """Parse 'hsk1-l3' to (1, 3)"""
         try:
-            parts = position_str.replace("hsk", "").split("-l")
-            return int(parts[0]), int(parts[1])
-        except:
+            return _parse_position(position_str)
+        except TypeError:
+            # Unhashable input (e.g. malformed seeded data) can't be cached
             return 0, 0
     
     def _is_word_safe(self, word: str, user_hsk: int, user_lesson: int) -> bool:
@@ -126,38 +398,24 @@ class VocabValidator:
             return True
         
         # Not in curriculum - could be punctuation or unknown
-        if word not in self.curriculum:
+        word_pos = self.curriculum_pos.get(word)
+        if word_pos is None:
             return False
         
-        word_pos = self.curriculum[word]
-        word_hsk, word_lesson = self._parse_position(word_pos)
-        
-        # Word learned in earlier HSK level
-        if word_hsk < user_hsk:
-            return True
-        
-        # Word in same HSK level but earlier lesson
-        if word_hsk == user_hsk and word_lesson <= user_lesson:
-            return True
-        
-        return False
+        # Earlier HSK level, or same HSK level and lesson <= user's
+        return word_pos <= (user_hsk, user_lesson)
     
     def _is_target_word(self, word: str, user_hsk: int, user_lesson: int) -> bool:
         """Check if word is a target word (currently learning)"""
-        if word not in self.curriculum:
-            return False
-        
-        word_pos = self.curriculum[word]
-        word_hsk, word_lesson = self._parse_position(word_pos)
-        
-        return word_hsk == user_hsk and word_lesson == user_lesson
+        return self.curriculum_pos.get(word) == (user_hsk, user_lesson)
     
     def validate(
         self,
         text: str,
         user_hsk: int,
         user_lesson: int,
-        target_words: list[str] = None
+        target_words: list[str] = None,
+        summary_only: bool = False
     ) -> dict:
         """
         Validate text against user's curriculum position.
@@ -170,36 +428,82 @@ class VocabValidator:
         - forbidden_words: words too advanced
         - unknown_words: words not in curriculum
         - stats: additional statistics
-        """
-        target_words = target_words or []
-        target_set = set(target_words)
         
-        # Segment text using jieba
-        words = list(jieba.cut(text))
+        With summary_only=True only valid and stats are returned.
         
-        # Filter out punctuation and whitespace
-        words = [w for w in words if w.strip() and not self._is_punctuation(w)]
+        Segmentation is memoized per text, so repeated texts only redo the
+        (cheap) classification.
+        """
+        return self._validate_impl(
+            text, user_hsk, user_lesson, tuple(target_words or ()), summary_only
+        )
+    
+    def validate_batch(
+        self,
+        texts: list[str],
+        user_hsk: int,
+        user_lesson: int,
+        target_words: list[str] = None
+    ) -> list[dict]:
+        """
+        Validate several texts at one curriculum position (see validate).
         
-        # Post-process: split words for learning (e.g., "我要" → ["我", "要"])
-        words = self._split_for_learning(words)
+        Returns one result per text, in order. Repeated texts reuse the
+        memoized segmentation.
+        """
+        target_words = tuple(target_words or ())
+        return [
+            self._validate_impl(text, user_hsk, user_lesson, target_words)
+            for text in texts
+        ]
+    
+    def _validate_impl(
+        self,
+        text: str,
+        user_hsk: int,
+        user_lesson: int,
+        target_words: tuple[str, ...],
+        summary_only: bool = False
+    ) -> dict:
+        """Curriculum-position validation on normalized arguments (see validate)"""
+        target_set = set(target_words)
         
-        # Categorize words
+        # Segment and split for learning (cached per text, independent of position);
+        # kept as the cached tuple - only copied if words_found is returned
+        words = self._learning_words_cached(text, self.cache_epoch)
+        
+        # Categorize each distinct word once; counts keep occurrence stats
+        counts = Counter(words)
         safe = []
         targets = []
         forbidden = []
         unknown = []
+        safe_occurrences = 0
         
-        for word in words:
-            if word in self.always_safe:
+        # Local bindings keep attribute lookups out of the loop
+        always_safe = self.always_safe
+        curriculum_pos = self.curriculum_pos
+        user_pos = (user_hsk, user_lesson)
+        
+        for word, n in counts.items():
+            if word in always_safe:
                 safe.append(word)
-            elif word in target_set:
+                safe_occurrences += n
+                continue
+            if word in target_set:
                 # Explicitly provided as target
                 targets.append(word)
-            elif word not in self.curriculum:
+                continue
+            
+            # Single lookup; same rules as _is_word_safe / _is_target_word
+            word_pos = curriculum_pos.get(word)
+            if word_pos is None:
                 unknown.append(word)
-            elif self._is_word_safe(word, user_hsk, user_lesson):
+            elif word_pos <= user_pos:
+                # Earlier HSK level, or same level and lesson <= user's
                 safe.append(word)
-            elif self._is_target_word(word, user_hsk, user_lesson):
+                safe_occurrences += n
+            elif word_pos == user_pos:
                 targets.append(word)
             else:
                 forbidden.append(word)
@@ -209,22 +513,26 @@ class VocabValidator:
         # (they might be names, new words, etc.)
         is_valid = len(forbidden) == 0
         
+        stats = {
+            "total_words": len(words),
+            "unique_words": len(counts),
+            "safe_count": len(safe),
+            "target_count": len(targets),
+            "forbidden_count": len(forbidden),
+            "unknown_count": len(unknown),
+            "safe_percentage": round(safe_occurrences / len(words) * 100, 1) if words else 0
+        }
+        if summary_only:
+            return {"valid": is_valid, "stats": stats}
+        
         return {
             "valid": is_valid,
-            "words_found": words,
-            "safe_words": list(set(safe)),
-            "target_words": list(set(targets)),
-            "forbidden_words": list(set(forbidden)),
-            "unknown_words": list(set(unknown)),
-            "stats": {
-                "total_words": len(words),
-                "unique_words": len(set(words)),
-                "safe_count": len(set(safe)),
-                "target_count": len(set(targets)),
-                "forbidden_count": len(set(forbidden)),
-                "unknown_count": len(set(unknown)),
-                "safe_percentage": round(len(safe) / len(words) * 100, 1) if words else 0
-            }
+            "words_found": list(words),
+            "safe_words": safe,
+            "target_words": targets,
+            "forbidden_words": forbidden,
+            "unknown_words": unknown,
+            "stats": stats
         }
 
     def validate_lesson(
@@ -232,7 +540,8 @@ class VocabValidator:
         text: str,
         lesson_number: int,
         focus_words: list[str],
-        hsk_level: int = 1
+        hsk_level: int = 1,
+        summary_only: bool = False
     ) -> dict:
         """
         Validate lesson text for strict i+1 compliance.
@@ -249,56 +558,88 @@ class VocabValidator:
         - focus_words_missing: Focus words NOT in text
         - unknown_words: Words not in curriculum
         - suggestion: Feedback for AI retry
+        
+        With summary_only=True only valid and stats are returned, and the
+        per-occurrence invalid word entries and suggestion are never built.
         """
+        return self._validate_lesson_impl(
+            text, lesson_number, tuple(focus_words), hsk_level, summary_only
+        )
+    
+    def _validate_lesson_impl(
+        self,
+        text: str,
+        lesson_number: int,
+        focus_words: tuple[str, ...],
+        hsk_level: int,
+        summary_only: bool = False
+    ) -> dict:
+        """i+1 validation on normalized arguments (see validate_lesson)"""
         focus_set = set(focus_words)
         
         # Segment text using jieba
-        words = list(jieba.cut(text))
-        words = [w for w in words if w.strip() and not self._is_punctuation(w)]
+        self.init_jieba()
+        words = _segment(text, _jieba_generation)
         
-        invalid_words = []
+        too_advanced = {}  # word -> absolute lesson, for words past the current lesson
+        invalid_count = 0
         unknown_words = []
         focus_found = set()
         
-        for word in words:
+        # Constant for the whole text - hoisted out of the loop
+        current_absolute_lesson = (hsk_level - 1) * 10 + lesson_number
+        always_safe = self.always_safe
+        curriculum_abs = self.curriculum_abs
+        
+        # Look up each distinct word once
+        counts = Counter(words)
+        
+        for word, n in counts.items():
             # Check if it's a focus word (i+1)
             if word in focus_set:
                 focus_found.add(word)
                 continue
             
             # Check if always safe
-            if word in self.always_safe:
+            if word in always_safe:
                 continue
             
-            # Check curriculum
-            if word not in self.curriculum:
+            # Check curriculum (precomputed absolute lesson ID)
+            word_absolute_lesson = curriculum_abs.get(word)
+            if word_absolute_lesson is None:
                 unknown_words.append(word)
                 continue
             
-            # Get word's lesson position
-            word_pos = self.curriculum[word]
-            word_hsk, word_lesson = self._parse_position(word_pos)
-            
-            # Calculate absolute lesson ID
-            # HSK1 lessons 1-10 = IDs 1-10
-            # HSK2 lessons 1-10 = IDs 11-20
-            # etc.
-            word_absolute_lesson = (word_hsk - 1) * 10 + word_lesson
-            current_absolute_lesson = (hsk_level - 1) * 10 + lesson_number
-            
             # Word must be from this lesson or earlier
             if word_absolute_lesson > current_absolute_lesson:
-                invalid_words.append({
-                    "word": word,
-                    "lesson_id": word_absolute_lesson,
-                    "reason": f"Word from lesson {word_absolute_lesson}, but current is {current_absolute_lesson}"
-                })
+                invalid_count += n
+                too_advanced[word] = word_absolute_lesson
         
         # Check which focus words are missing
         focus_missing = list(focus_set - focus_found)
         
         # Build response
-        is_valid = len(invalid_words) == 0
+        is_valid = invalid_count == 0
+        stats = {
+            "total_words": len(words),
+            "unique_words": len(counts),
+            "invalid_count": invalid_count,
+            "unknown_count": len(unknown_words),
+            "focus_coverage": f"{len(focus_found)}/{len(focus_words)}"
+        }
+        if summary_only:
+            return {"valid": is_valid and len(focus_missing) == 0, "stats": stats}
+        
+        # One entry per occurrence, in text order
+        invalid_words = [
+            {
+                "word": word,
+                "lesson_id": too_advanced[word],
+                "reason": f"Word from lesson {too_advanced[word]}, but current is {current_absolute_lesson}"
+            }
+            for word in words
+            if word in too_advanced
+        ] if too_advanced else []
         
         suggestion = None
         if not is_valid:
@@ -312,21 +653,14 @@ class VocabValidator:
             "invalid_words": invalid_words,
             "focus_words_found": list(focus_found),
             "focus_words_missing": focus_missing,
-            "unknown_words": list(set(unknown_words)),
+            "unknown_words": unknown_words,
             "suggestion": suggestion,
-            "stats": {
-                "total_words": len(words),
-                "unique_words": len(set(words)),
-                "invalid_count": len(invalid_words),
-                "unknown_count": len(set(unknown_words)),
-                "focus_coverage": f"{len(focus_found)}/{len(focus_words)}"
-            }
+            "stats": stats
         }
     
     def _is_punctuation(self, char: str) -> bool:
         """Check if string is punctuation"""
-        punctuation = set("，。！？、；：""''（）【】《》…—·,.!?;:\"'()[]<>-_ \n\t")
-        return all(c in punctuation for c in char)
+        return _punctuation_match(char) is not None
 
     # ═══════════════════════════════════════════════════════════
     # AI Tutor Lesson Validation (Enhanced)
@@ -338,7 +672,8 @@ class VocabValidator:
         user_lesson_position: int,
         hsk_level: int,
         focus_words: list[str],
-        allowed_words: list[str] = None
+        allowed_words: list[str] = None,
+        summary_only: bool = False
     ) -> dict:
         """
         Validate reading content with structured feedback for AI retry.
@@ -347,15 +682,21 @@ class VocabValidator:
         - Unknown word ratio
         - Specific problem words
         - Suggestions for retry prompt
+        
+        With summary_only=True only ok, unknown_ratio, too_hard and too_easy
+        are returned (no word lists or suggestions).
         """
         focus_set = set(focus_words)
-        allowed_set = set(allowed_words) if allowed_words else None
+        # allowed_words (if given) plus always_safe, merged once for a single probe
+        known_set = self.always_safe.union(allowed_words) if allowed_words else None
         
         # Segment text
-        words = list(jieba.cut(chinese_text))
-        words = [w for w in words if w.strip() and not self._is_punctuation(w)]
+        self.init_jieba()
+        words = _segment(chinese_text, _jieba_generation)
         
         if not words:
+            if summary_only:
+                return {"ok": False, "unknown_ratio": 1.0, "too_hard": True, "too_easy": False}
             return {
                 "ok": False,
                 "unknown_ratio": 1.0,
@@ -372,53 +713,41 @@ class VocabValidator:
                 }
             }
         
-        # Categorize words
+        # Categorize each distinct word once; counts weight the ratio
         focus_found = set()
         unknown_words = []
         too_advanced = []
         known_count = 0
+        unknown_count = 0
         
-        current_absolute = (hsk_level - 1) * 10 + user_lesson_position
-        
-        for word in words:
-            # Focus words count as known for ratio calculation
-            if word in focus_set:
-                focus_found.add(word)
-                known_count += 1
-                continue
-            
-            # Always safe words
-            if word in self.always_safe:
-                known_count += 1
-                continue
-            
-            # If allowed_words provided, use that as the ceiling
-            if allowed_set is not None:
-                if word in allowed_set:
-                    known_count += 1
+        if known_set is not None:
+            # allowed_words (plus always safe) is the ceiling
+            for word, n in Counter(words).items():
+                # Focus words count as known for ratio calculation
+                if word in focus_set:
+                    focus_found.add(word)
+                    known_count += n
+                elif word in known_set:
+                    known_count += n
                 else:
                     unknown_words.append(word)
-                continue
-            
-            # Check curriculum
-            if word not in self.curriculum:
-                unknown_words.append(word)
-                continue
-            
-            # Check lesson position
-            word_pos = self.curriculum[word]
-            word_hsk, word_lesson = self._parse_position(word_pos)
-            word_absolute = (word_hsk - 1) * 10 + word_lesson
-            
-            if word_absolute <= current_absolute:
-                known_count += 1
-            else:
-                too_advanced.append(word)
-                unknown_words.append(word)
+                    unknown_count += n
+        else:
+            # Curriculum position is the ceiling (cached, shared with pedagogy)
+            focus_hits, not_in_curriculum, advanced = self._classify_words_cached(
+                words, (hsk_level - 1) * 10 + user_lesson_position, frozenset(focus_set),
+                self.cache_epoch
+            )
+            focus_found.update(word for word, _ in focus_hits)
+            too_advanced = [word for word, _, _ in advanced]
+            unknown_words = [word for word, _ in not_in_curriculum] + too_advanced
+            unknown_count = (
+                sum(n for _, n in not_in_curriculum) + sum(n for _, n, _ in advanced)
+            )
+            known_count = len(words) - unknown_count
         
         # Calculate ratio
         total_words = len(words)
-        unknown_count = len(unknown_words)
         unknown_ratio = unknown_count / total_words if total_words > 0 else 0
         
         # Determine if too hard or too easy
@@ -433,11 +762,19 @@ class VocabValidator:
         # OK if: not too hard, all focus words present
         ok = not too_hard and len(focus_missing) == 0
         
+        if summary_only:
+            return {
+                "ok": ok,
+                "unknown_ratio": round(unknown_ratio, 3),
+                "too_hard": too_hard,
+                "too_easy": too_easy
+            }
+        
         # Build suggestions for retry
         suggestions = None
         if not ok:
             suggestions = {
-                "ban_tokens": list(set(too_advanced))[:10],  # Top 10 problem words
+                "ban_tokens": too_advanced[:10],  # Top 10 problem words
                 "require_tokens": focus_missing,
                 "target_range": {
                     "min_unknown_ratio": 0.10,
@@ -451,7 +788,7 @@ class VocabValidator:
             "focus_words_found": list(focus_found),
             "focus_words_missing": focus_missing,
             "new_words_for_user": list(set(unknown_words) - set(too_advanced)),
-            "too_many_unknowns": list(set(too_advanced)),
+            "too_many_unknowns": too_advanced,
             "too_hard": too_hard,
             "too_easy": too_easy,
             "suggestions": suggestions
@@ -472,7 +809,8 @@ class VocabValidator:
         - No illegal characters
         - Length constraints
         """
-        allowed_set = set(allowed_words)
+        # always_safe merged in once so word checks need a single probe
+        allowed_set = self.always_safe.union(allowed_words)
         errors = []
         warnings = []
         seen_ids = set()
@@ -495,16 +833,12 @@ class VocabValidator:
             seen_ids.add(ex_id)
             
             # Validate based on type
-            if ex_type == "multiple_choice":
-                self._validate_mcq(ex, ex_id, allowed_set, errors, warnings, fixable)
-            elif ex_type == "drag_sentence":
-                self._validate_drag(ex, ex_id, allowed_set, errors, warnings, fixable)
-            elif ex_type == "spot_error":
-                self._validate_spot_error(ex, ex_id, allowed_set, errors, warnings, fixable)
-            elif ex_type == "build_sentence":
-                self._validate_build(ex, ex_id, allowed_set, errors, warnings, fixable)
-            elif ex_type == "read_comp":
-                self._validate_read_comp(ex, ex_id, allowed_set, errors, warnings, fixable)
+            spec = self._exercise_types.get(ex_type)
+            if spec is not None:
+                fields, _, check = spec
+                self._check_words_allowed(ex_id, fields(ex), allowed_set, errors, fixable)
+                if check is not None:
+                    check(ex, ex_id, errors, warnings)
             else:
                 errors.append({
                     "exercise_id": ex_id,
@@ -524,52 +858,111 @@ class VocabValidator:
 
     def _extract_chinese_words(self, text: str) -> list[str]:
         """Extract Chinese words from text, split for learning"""
-        words = list(jieba.cut(text))
-        words = [w for w in words if w.strip() and not self._is_punctuation(w)]
+        return list(self._learning_words_cached(text, self.cache_epoch))
+    
+    def _segment_for_learning(self, text: str, epoch: int) -> tuple[str, ...]:
+        """Uncached segmentation + learning split (see _extract_chinese_words; epoch is only a cache key)"""
+        self.init_jieba()
+        words = _segment(text, _jieba_generation)
+        # Common case: nothing to split, so share jieba's cached tuple as-is
+        known = self.known_words
+        if all(len(w) == 1 or w in known for w in words):
+            return words
         # Post-process: split words for learning (e.g., "我要" → ["我", "要"])
-        return self._split_for_learning(words)
+        return tuple(self._split_for_learning(words))
+
+    @staticmethod
+    def _chinese_fields(ex: dict, key: str) -> list[tuple[str, str]]:
+        """(path, chinese) for ex[key], if it has Chinese text"""
+        obj = ex.get(key, {})
+        return [(f"{key}.chinese", obj["chinese"])] if "chinese" in obj else []
+    
+    @staticmethod
+    def _chinese_list_fields(ex: dict, key: str) -> list[tuple[str, str]]:
+        """(path, chinese) for each entry of the list ex[key] with Chinese text"""
+        return [
+            (f"{key}[{i}].chinese", item["chinese"])
+            for i, item in enumerate(ex.get(key, []))
+            if "chinese" in item
+        ]
+    
+    def _mcq_fields(self, ex: dict) -> list[tuple[str, str]]:
+        """Multiple choice: question and options"""
+        return self._chinese_fields(ex, "question") + self._chinese_list_fields(ex, "options")
+    
+    def _drag_fields(self, ex: dict) -> list[tuple[str, str]]:
+        """Drag sentence: target sentence and shuffled words"""
+        return (
+            self._chinese_fields(ex, "targetSentence")
+            + self._chinese_list_fields(ex, "shuffledWords")
+        )
+    
+    def _spot_error_fields(self, ex: dict) -> list[tuple[str, str]]:
+        """
+        Spot error: correction only (the sentence might intentionally
+        have wrong words)
+        """
+        correction = ex.get("correction", {})
+        if "correct" in correction:
+            return [("correction.correct", correction["correct"])]
+        return []
+    
+    def _build_fields(self, ex: dict) -> list[tuple[str, str]]:
+        """Build sentence: expected answer, available words and variations"""
+        return (
+            self._chinese_fields(ex, "expectedAnswer")
+            + self._chinese_list_fields(ex, "availableWords")
+            + [
+                (f"acceptableVariations[{i}]", variation)
+                for i, variation in enumerate(ex.get("acceptableVariations", []))
+            ]
+        )
+    
+    def _read_comp_fields(self, ex: dict) -> list[tuple[str, str]]:
+        """Reading comprehension: passage, question and options"""
+        return (
+            self._chinese_fields(ex, "passage")
+            + self._chinese_fields(ex, "question")
+            + self._chinese_list_fields(ex, "options")
+        )
 
     def _check_words_allowed(
         self,
-        text: str,
         ex_id: str,
-        field: str,
+        fields: list[tuple[str, str]],
         allowed_set: set,
         errors: list,
         fixable: list
     ):
-        """Check if all Chinese words in text are allowed"""
-        words = self._extract_chinese_words(text)
-        for word in words:
-            if word not in self.always_safe and word not in allowed_set:
-                errors.append({
-                    "exercise_id": ex_id,
-                    "field": field,
-                    "error": f"Word '{word}' not in allowed_words",
-                    "severity": "error"
-                })
-                if ex_id not in fixable:
-                    fixable.append(ex_id)
-
-    def _validate_mcq(self, ex, ex_id, allowed_set, errors, warnings, fixable):
-        """Validate multiple choice exercise"""
-        # Check question
-        question = ex.get("question", {})
-        if "chinese" in question:
-            self._check_words_allowed(question["chinese"], ex_id, "question.chinese", allowed_set, errors, fixable)
-        
-        # Check options
-        options = ex.get("options", [])
-        correct_id = ex.get("correctOptionId")
-        option_ids = []
+        """
+        Check that all Chinese words across an exercise's fields are allowed.
         
-        for i, opt in enumerate(options):
-            opt_id = opt.get("id", f"opt_{i}")
-            option_ids.append(opt_id)
-            if "chinese" in opt:
-                self._check_words_allowed(opt["chinese"], ex_id, f"options[{i}].chinese", allowed_set, errors, fixable)
+        allowed_set must already include always_safe.
+        """
+        bad = [
+            (field, word)
+            for field, text in fields
+            for word in self._extract_chinese_words(text)
+            if word not in allowed_set
+        ]
+        if not bad:
+            return
+        
+        for field, word in bad:
+            errors.append({
+                "exercise_id": ex_id,
+                "field": field,
+                "error": f"Word '{word}' not in allowed_words",
+                "severity": "error"
+            })
+        if ex_id not in fixable:
+            fixable.append(ex_id)
+
+    def _check_correct_option(self, ex, ex_id, errors, warnings):
+        """Multiple choice / reading comprehension: correct option exists"""
+        correct_id = ex.get("correctOptionId")
+        option_ids = {opt.get("id", f"opt_{i}") for i, opt in enumerate(ex.get("options", []))}
         
-        # Check correct option exists
         if correct_id and correct_id not in option_ids:
             errors.append({
                 "exercise_id": ex_id,
@@ -578,23 +971,10 @@ class VocabValidator:
                 "severity": "error"
             })
 
-    def _validate_drag(self, ex, ex_id, allowed_set, errors, warnings, fixable):
-        """Validate drag sentence exercise"""
-        # Check target sentence
-        target = ex.get("targetSentence", {})
-        if "chinese" in target:
-            self._check_words_allowed(target["chinese"], ex_id, "targetSentence.chinese", allowed_set, errors, fixable)
-        
-        # Check shuffled words
+    def _check_drag_positions(self, ex, ex_id, errors, warnings):
+        """Drag sentence: positions are valid"""
         shuffled = ex.get("shuffledWords", [])
-        positions = []
-        for i, word in enumerate(shuffled):
-            if "chinese" in word:
-                self._check_words_allowed(word["chinese"], ex_id, f"shuffledWords[{i}].chinese", allowed_set, errors, fixable)
-            if "correctPosition" in word:
-                positions.append(word["correctPosition"])
-        
-        # Check positions are valid
+        positions = [word["correctPosition"] for word in shuffled if "correctPosition" in word]
         expected_positions = list(range(len(shuffled)))
         if sorted(positions) != expected_positions:
             warnings.append({
@@ -604,24 +984,11 @@ class VocabValidator:
                 "severity": "warning"
             })
 
-    def _validate_spot_error(self, ex, ex_id, allowed_set, errors, warnings, fixable):
-        """Validate spot error exercise"""
-        # Check sentence
-        sentence = ex.get("sentence", {})
-        if "chinese" in sentence:
-            # Note: spot_error might intentionally have wrong words
-            # So we check the correction instead
-            pass
-        
-        # Check correction
-        correction = ex.get("correction", {})
-        if "correct" in correction:
-            self._check_words_allowed(correction["correct"], ex_id, "correction.correct", allowed_set, errors, fixable)
-        
-        # Check words array
+    def _check_error_word(self, ex, ex_id, errors, warnings):
+        """Spot error: errorWordId is in the words array"""
         words = ex.get("words", [])
         error_word_id = ex.get("errorWordId")
-        word_ids = [w.get("id") for w in words]
+        word_ids = {w.get("id") for w in words}
         
         if error_word_id and error_word_id not in word_ids:
             errors.append({
@@ -631,54 +998,6 @@ class VocabValidator:
                 "severity": "error"
             })
 
-    def _validate_build(self, ex, ex_id, allowed_set, errors, warnings, fixable):
-        """Validate build sentence exercise"""
-        # Check expected answer
-        expected = ex.get("expectedAnswer", {})
-        if "chinese" in expected:
-            self._check_words_allowed(expected["chinese"], ex_id, "expectedAnswer.chinese", allowed_set, errors, fixable)
-        
-        # Check available words
-        available = ex.get("availableWords", [])
-        for i, word in enumerate(available):
-            if "chinese" in word:
-                self._check_words_allowed(word["chinese"], ex_id, f"availableWords[{i}].chinese", allowed_set, errors, fixable)
-        
-        # Check variations
-        for i, variation in enumerate(ex.get("acceptableVariations", [])):
-            self._check_words_allowed(variation, ex_id, f"acceptableVariations[{i}]", allowed_set, errors, fixable)
-
-    def _validate_read_comp(self, ex, ex_id, allowed_set, errors, warnings, fixable):
-        """Validate reading comprehension exercise"""
-        # Check passage
-        passage = ex.get("passage", {})
-        if "chinese" in passage:
-            self._check_words_allowed(passage["chinese"], ex_id, "passage.chinese", allowed_set, errors, fixable)
-        
-        # Check question
-        question = ex.get("question", {})
-        if "chinese" in question:
-            self._check_words_allowed(question["chinese"], ex_id, "question.chinese", allowed_set, errors, fixable)
-        
-        # Check options
-        options = ex.get("options", [])
-        correct_id = ex.get("correctOptionId")
-        option_ids = []
-        
-        for i, opt in enumerate(options):
-            opt_id = opt.get("id", f"opt_{i}")
-            option_ids.append(opt_id)
-            if "chinese" in opt:
-                self._check_words_allowed(opt["chinese"], ex_id, f"options[{i}].chinese", allowed_set, errors, fixable)
-        
-        if correct_id and correct_id not in option_ids:
-            errors.append({
-                "exercise_id": ex_id,
-                "field": "correctOptionId",
-                "error": f"correctOptionId '{correct_id}' not in options",
-                "severity": "error"
-            })
-
     def validate_pedagogy(
         self,
         reading_chinese: str,
@@ -701,10 +1020,10 @@ class VocabValidator:
         items = []
         focus_tested = {}  # Track which focus words are tested
         
-        # Validate reading
+        # Validate reading (segmented once here, helpers take word lists)
         reading_result = self._validate_item_pedagogy(
             "reading",
-            reading_chinese,
+            self._extract_chinese_words(reading_chinese),
             current_absolute,
             focus_set
         )
@@ -717,13 +1036,14 @@ class VocabValidator:
             ex_id = ex.get("id", "unknown")
             ex_type = ex.get("type", "unknown")
             
-            # Extract Chinese text based on exercise type
-            chinese_texts = self._extract_exercise_chinese(ex, ex_type)
-            combined_text = " ".join(chinese_texts)
+            # Segment each field separately so tokens never span two fields
+            combined_words = list(chain.from_iterable(
+                self._extract_exercise_chinese(ex, ex_type)
+            ))
             
             result = self._validate_item_pedagogy(
                 ex_id,
-                combined_text,
+                combined_words,
                 current_absolute,
                 focus_set,
                 max_unknown_ratio=0.30  # Exercises can be slightly harder
@@ -734,7 +1054,7 @@ class VocabValidator:
         
         # Check coverage
         tested = list(focus_tested.keys())
-        untested = [fw for fw in focus_words if fw not in focus_tested]
+        untested = list(focus_set - focus_tested.keys())
         
         # Overall OK if all items pass and all focus words tested
         all_ok = all(item["ok"] for item in items) and len(untested) == 0
@@ -749,17 +1069,56 @@ class VocabValidator:
             }
         }
 
+    def _classify_words(
+        self,
+        words: tuple[str, ...],
+        current_absolute: int,
+        focus_words: frozenset,
+        epoch: int
+    ) -> tuple[tuple, tuple, tuple]:
+        """
+        Classify distinct words against the curriculum at current_absolute.
+        
+        Returns (focus_hits, not_in_curriculum, too_advanced) in first-occurrence
+        order: (word, count) pairs for the first two and (word, count,
+        absolute lesson) for the last. Focus and always-safe words count as known.
+        epoch is only part of the _classify_words_cached key.
+        
+        Reading validation passes raw _segment tokens while pedagogy passes
+        learning-split tokens (see _extract_chinese_words), so the two only
+        share a cached entry when the learning split leaves the text unchanged.
+        """
+        focus_hits = []
+        not_in_curriculum = []
+        too_advanced = []
+        always_safe = self.always_safe
+        curriculum_abs = self.curriculum_abs
+        
+        for word, n in Counter(words).items():
+            if word in focus_words:
+                focus_hits.append((word, n))
+                continue
+            
+            if word in always_safe:
+                continue
+            
+            word_absolute = curriculum_abs.get(word)
+            if word_absolute is None:
+                not_in_curriculum.append((word, n))
+            elif word_absolute > current_absolute:
+                too_advanced.append((word, n, word_absolute))
+        
+        return tuple(focus_hits), tuple(not_in_curriculum), tuple(too_advanced)
+
     def _validate_item_pedagogy(
         self,
         item_id: str,
-        chinese_text: str,
+        words: list[str],
         current_absolute: int,
         focus_set: set,
         max_unknown_ratio: float = 0.25
     ) -> dict:
-        """Validate a single item for pedagogy"""
-        words = self._extract_chinese_words(chinese_text)
-        
+        """Validate a single item for pedagogy (words already segmented)"""
         if not words:
             return {
                 "id": item_id,
@@ -770,29 +1129,19 @@ class VocabValidator:
                 "issues": []
             }
         
-        unknown_count = 0
-        issues = []
-        focus_in_item = []
-        
-        for word in words:
-            if word in focus_set:
-                focus_in_item.append(word)
-                continue
-            
-            if word in self.always_safe:
-                continue
-            
-            if word not in self.curriculum:
-                unknown_count += 1
-                continue
-            
-            word_pos = self.curriculum[word]
-            word_hsk, word_lesson = self._parse_position(word_pos)
-            word_absolute = (word_hsk - 1) * 10 + word_lesson
-            
-            if word_absolute > current_absolute:
-                unknown_count += 1
-                issues.append(f"Word '{word}' from lesson {word_absolute} exceeds current {current_absolute}")
+        focus_hits, not_in_curriculum, advanced = self._classify_words_cached(
+            tuple(words), current_absolute, frozenset(focus_set), self.cache_epoch
+        )
+        # Hits keep first-occurrence order, so focus_in_item[0] is unchanged
+        focus_in_item = [word for word, _ in focus_hits]
+        unknown_count = sum(n for _, n in not_in_curriculum) + sum(n for _, n, _ in advanced)
+        # One issue per occurrence, in text order
+        advanced_abs = {word: word_absolute for word, _, word_absolute in advanced}
+        issues = [
+            f"Word '{word}' from lesson {advanced_abs[word]} exceeds current {current_absolute}"
+            for word in words
+            if word in advanced_abs
+        ] if advanced_abs else []
         
         unknown_ratio = unknown_count / len(words)
         
@@ -804,38 +1153,19 @@ class VocabValidator:
             "ok": len(issues) == 0,
             "unknown_ratio": round(unknown_ratio, 3),
             "focus_word_tested": focus_in_item[0] if focus_in_item else None,
-            "focus_words_in_item": list(set(focus_in_item)),
+            "focus_words_in_item": focus_in_item,
             "issues": issues
         }
 
-    def _extract_exercise_chinese(self, ex: dict, ex_type: str) -> list[str]:
-        """Extract all Chinese text from an exercise"""
-        texts = []
-        
-        if ex_type == "multiple_choice":
-            if "question" in ex and "chinese" in ex["question"]:
-                texts.append(ex["question"]["chinese"])
-            for opt in ex.get("options", []):
-                if "chinese" in opt:
-                    texts.append(opt["chinese"])
-        
-        elif ex_type == "drag_sentence":
-            if "targetSentence" in ex and "chinese" in ex["targetSentence"]:
-                texts.append(ex["targetSentence"]["chinese"])
-        
-        elif ex_type == "spot_error":
-            if "correction" in ex and "correct" in ex["correction"]:
-                texts.append(ex["correction"]["correct"])
-        
-        elif ex_type == "build_sentence":
-            if "expectedAnswer" in ex and "chinese" in ex["expectedAnswer"]:
-                texts.append(ex["expectedAnswer"]["chinese"])
-        
-        elif ex_type == "read_comp":
-            if "passage" in ex and "chinese" in ex["passage"]:
-                texts.append(ex["passage"]["chinese"])
-            if "question" in ex and "chinese" in ex["question"]:
-                texts.append(ex["question"]["chinese"])
-        
-        return texts
+    def _extract_exercise_chinese(self, ex: dict, ex_type: str) -> list[list[str]]:
+        """Extract an exercise's pedagogy-scored Chinese text, segmented per field"""
+        spec = self._exercise_types.get(ex_type)
+        if spec is None:
+            return []
+        fields, pedagogy_fields, _ = spec
+        return [
+            self._extract_chinese_words(text)
+            for field, text in fields(ex)
+            if pedagogy_fields is None or field in pedagogy_fields
+        ]
 
@@ -3,101 +3,180 @@ Pytest fixtures for vocab-validator tests
 """
 
 import pytest
+import httpx
 import json
 import os
-import tempfile
-import shutil
 from fastapi.testclient import TestClient
-from app.validator import VocabValidator
+from app.validator import VocabValidator, _segment
+
+try:
+    import orjson  # Optional: faster fixture writes (falls back to stdlib json)
+except ImportError:
+    orjson = None
+
+
+def _write_json(path, data):
+    """Write fixture JSON as UTF-8 (orjson when available)"""
+    if orjson:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+TEST_API_KEY = "test-api-key-12345"
+
+# Comprehensive curriculum for realistic API tests
+API_CURRICULUM = {
+    "words": {
+        # HSK 1, Lesson 1-5
+        "你": "hsk1-l1",
+        "好": "hsk1-l1",
+        "你好": "hsk1-l1",
+        "我": "hsk1-l1",
+        "是": "hsk1-l1",
+        "谢谢": "hsk1-l1",
+        "再见": "hsk1-l1",
+        "他": "hsk1-l1",
+        "她": "hsk1-l1",
+        "吃": "hsk1-l2",
+        "喝": "hsk1-l2",
+        "水": "hsk1-l2",
+        "饭": "hsk1-l2",
+        "看": "hsk1-l2",
+        "学习": "hsk1-l3",
+        "工作": "hsk1-l3",
+        "学生": "hsk1-l3",
+        "老师": "hsk1-l3",
+        "中文": "hsk1-l4",
+        "中国": "hsk1-l4",
+        "人": "hsk1-l4",
+        "说": "hsk1-l5",
+        "汉语": "hsk1-l5",
+        "朋友": "hsk1-l6",
+        "今天": "hsk1-l7",
+        "明天": "hsk1-l8",
+        "去": "hsk1-l9",
+        "来": "hsk1-l10",
+        # HSK 2
+        "可能": "hsk2-l1",
+        "图书馆": "hsk2-l1",
+        "应该": "hsk2-l1",
+        "需要": "hsk2-l1",
+        "能": "hsk2-l1",
+        "考试": "hsk2-l2",
+        "虽然": "hsk2-l2",
+        "但是": "hsk2-l2",
+        "因为": "hsk2-l2",
+        "所以": "hsk2-l2",
+        # HSK 3
+        "聪明": "hsk3-l1",
+        "努力": "hsk3-l1",
+    },
+    "version": "test-v1"
+}
 
 
 # ═══════════════════════════════════════════════════════════
 # Shared API Client Fixtures
 # ═══════════════════════════════════════════════════════════
 
-@pytest.fixture(scope="module")
-def mock_data_dir():
-    """Create mock data directory before app import"""
-    temp_dir = tempfile.mkdtemp()
-    
-    # Create comprehensive curriculum for realistic tests
-    curriculum = {
-        "words": {
-            # HSK 1, Lesson 1-5
-            "你": "hsk1-l1",
-            "好": "hsk1-l1",
-            "你好": "hsk1-l1",
-            "我": "hsk1-l1",
-            "是": "hsk1-l1",
-            "谢谢": "hsk1-l1",
-            "再见": "hsk1-l1",
-            "他": "hsk1-l1",
-            "她": "hsk1-l1",
-            "吃": "hsk1-l2",
-            "喝": "hsk1-l2",
-            "水": "hsk1-l2",
-            "饭": "hsk1-l2",
-            "看": "hsk1-l2",
-            "学习": "hsk1-l3",
-            "工作": "hsk1-l3",
-            "学生": "hsk1-l3",
-            "老师": "hsk1-l3",
-            "中文": "hsk1-l4",
-            "中国": "hsk1-l4",
-            "人": "hsk1-l4",
-            "说": "hsk1-l5",
-            "汉语": "hsk1-l5",
-            "朋友": "hsk1-l6",
-            "今天": "hsk1-l7",
-            "明天": "hsk1-l8",
-            "去": "hsk1-l9",
-            "来": "hsk1-l10",
-            # HSK 2
-            "可能": "hsk2-l1",
-            "图书馆": "hsk2-l1",
-            "应该": "hsk2-l1",
-            "需要": "hsk2-l1",
-            "能": "hsk2-l1",
-            "考试": "hsk2-l2",
-            "虽然": "hsk2-l2",
-            "但是": "hsk2-l2",
-        },
-        "version": "test-v1"
-    }
+@pytest.fixture(scope="session")
+def jieba_ready():
+    """Build jieba's (process-global) dictionary once per test run"""
+    # The validator's module, so jieba_fast is warmed when it's installed
+    from app.validator import jieba
+    jieba.initialize()
+
+
+@pytest.fixture(scope="session")
+def mock_data_dir(tmp_path_factory):
+    """Create mock data directory before app import (read by the app's startup load)"""
+    temp_dir = str(tmp_path_factory.mktemp("vocab"))
     
     # Write curriculum.json
     curriculum_path = os.path.join(temp_dir, "curriculum.json")
-    with open(curriculum_path, "w", encoding="utf-8") as f:
-        json.dump(curriculum, f, ensure_ascii=False)
+    _write_json(curriculum_path, API_CURRICULUM)
     
     # Write version.txt
     version_path = os.path.join(temp_dir, "version.txt")
     with open(version_path, "w") as f:
-        f.write("test-v1")
-    
-    yield temp_dir
+        f.write(API_CURRICULUM["version"])
     
-    shutil.rmtree(temp_dir)
+    return temp_dir
 
 
-@pytest.fixture(scope="module")
-def client(mock_data_dir):
-    """Create test client with mock data"""
-    import jieba
-    
+@pytest.fixture(scope="session")
+def app_env(mock_data_dir):
+    """Point the app at the mock data before it is imported (restored when the session ends)"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DATA_DIR", mock_data_dir)
+        mp.setenv("ENVIRONMENT", "development")  # Allow no API key in tests
+        mp.setenv("VALIDATOR_API_KEY", TEST_API_KEY)
+        yield
+
+
+@pytest.fixture(scope="session")
+def client(mock_data_dir, app_env, jieba_ready):
+    """Create test client with mock data (once per test run)"""
     from app.main import app, validator
     
-    # Load curriculum into validator
+    # Hand the curriculum to the validator directly (same data as the file
+    # in mock_data_dir, without re-reading and parsing it)
     validator.data_dir = mock_data_dir
-    validator.curriculum = {}
-    validator.loaded = False
-    validator.load()
+    validator.curriculum = dict(API_CURRICULUM["words"])
+    validator.version = API_CURRICULUM["version"]
+    validator.loaded = True
+    validator.rebuild_index()
     
     # Add words to jieba for proper segmentation
-    for word in validator.curriculum.keys():
-        jieba.add_word(word, freq=1000)
+    validator.register_words(validator.curriculum, freq=1000)  # High frequency to ensure it's used
     
-    return TestClient(app)
+    # Enter the client here so app startup and its event-loop portal run once
+    # during setup rather than inside whichever test sends the first request
+    with TestClient(app) as test_client:
+        # Send one request per endpoint so first-call costs (route and model
+        # setup, jieba's warmup task) land here too, then drop what those
+        # requests cached so tests still run the full validation path
+        test_client.get("/health")
+        test_client.get("/version")
+        test_client.get("/get-vocabulary?max_lesson=3")
+        test_client.post("/validate", json={
+            "text": "你好",
+            "user_position": {"hsk": 1, "lesson": 1},
+            "target_words": []
+        })
+        test_client.post("/validate-lesson", json={
+            "text": "你好",
+            "lesson_number": 1,
+            "focus_words": [],
+            "hsk_level": 1
+        })
+        validator.clear_caches()
+        
+        yield test_client
+
+
+@pytest.fixture
+async def aclient(client):
+    """Async client on the same app, for tests that send independent requests together"""
+    transport = httpx.ASGITransport(app=client.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session")
+def api_key():
+    """Return the test API key"""
+    return TEST_API_KEY
+
+
+@pytest.fixture(autouse=True)
+def reset_segment_cache():
+    """Start each test with an empty process-wide segmentation cache"""
+    _segment.cache_clear()
+    yield
 
 
 # ═══════════════════════════════════════════════════════════
@@ -139,24 +218,20 @@ def mock_curriculum():
 
 
 @pytest.fixture
-def temp_data_dir(mock_curriculum):
+def temp_data_dir(mock_curriculum, tmp_path):
     """Create a temporary directory with mock curriculum data"""
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = str(tmp_path)
     
     # Write curriculum.json
     curriculum_path = os.path.join(temp_dir, "curriculum.json")
-    with open(curriculum_path, "w", encoding="utf-8") as f:
-        json.dump(mock_curriculum, f, ensure_ascii=False)
+    _write_json(curriculum_path, mock_curriculum)
     
     # Write version.txt
     version_path = os.path.join(temp_dir, "version.txt")
     with open(version_path, "w") as f:
         f.write(mock_curriculum["version"])
     
-    yield temp_dir
-    
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    return temp_dir
 
 
 @pytest.fixture
@@ -4,108 +4,10 @@ API integration tests for vocab-validator FastAPI endpoints
 Tests the HTTP API without external dependencies.
 """
 
+import asyncio
+import threading
 import pytest
-import json
-import os
-import tempfile
-import shutil
-from fastapi.testclient import TestClient
-
-
-# We need to set up the data directory BEFORE importing the app
-@pytest.fixture(scope="module")
-def mock_data_dir():
-    """Create mock data directory before app import"""
-    temp_dir = tempfile.mkdtemp()
-    
-    # Create comprehensive curriculum for realistic tests
-    # Words need to be added to jieba for proper segmentation
-    curriculum = {
-        "words": {
-            # HSK 1, Lesson 1 - Basic greetings
-            "你": "hsk1-l1",
-            "好": "hsk1-l1",
-            "你好": "hsk1-l1",
-            "我": "hsk1-l1",
-            "是": "hsk1-l1",
-            "谢谢": "hsk1-l1",
-            "再见": "hsk1-l1",
-            "他": "hsk1-l1",
-            "她": "hsk1-l1",
-            # HSK 1, Lesson 2 - Actions
-            "吃": "hsk1-l2",
-            "喝": "hsk1-l2",
-            "水": "hsk1-l2",
-            "饭": "hsk1-l2",
-            "看": "hsk1-l2",
-            # HSK 1, Lesson 3 - Learning
-            "学习": "hsk1-l3",
-            "工作": "hsk1-l3",
-            "学生": "hsk1-l3",
-            "老师": "hsk1-l3",
-            # HSK 2, Lesson 1 - Modal verbs
-            "可能": "hsk2-l1",
-            "应该": "hsk2-l1",
-            "需要": "hsk2-l1",
-            "能": "hsk2-l1",
-            # HSK 2, Lesson 2 - Conjunctions
-            "虽然": "hsk2-l2",
-            "但是": "hsk2-l2",
-            "因为": "hsk2-l2",
-            "所以": "hsk2-l2",
-            # HSK 3, Lesson 1 - Adjectives
-            "聪明": "hsk3-l1",
-            "努力": "hsk3-l1",
-        },
-        "version": "api-test-v1"
-    }
-    
-    with open(os.path.join(temp_dir, "curriculum.json"), "w", encoding="utf-8") as f:
-        json.dump(curriculum, f, ensure_ascii=False)
-    
-    with open(os.path.join(temp_dir, "version.txt"), "w") as f:
-        f.write("api-test-v1")
-    
-    # Set env vars before import
-    os.environ["DATA_DIR"] = temp_dir
-    os.environ["ENVIRONMENT"] = "development"  # Allow no API key in tests
-    os.environ["VALIDATOR_API_KEY"] = "test-api-key-12345"  # Set test API key
-    
-    yield temp_dir
-    
-    shutil.rmtree(temp_dir)
-
-
-@pytest.fixture(scope="module")
-def client(mock_data_dir):
-    """Create test client with mock data"""
-    import jieba
-    
-    # Import after setting DATA_DIR - this ensures the app reads our mock dir
-    from app.main import app, validator
-    
-    # Clear jieba's dictionary and reload with fresh data
-    validator.data_dir = mock_data_dir
-    validator.curriculum = {}
-    validator.loaded = False
-    validator.load()
-    
-    # Re-add all curriculum words to jieba for proper segmentation
-    for word in validator.curriculum.keys():
-        jieba.add_word(word, freq=1000)  # High frequency to ensure it's used
-    
-    # Debug: verify curriculum loaded correctly
-    assert len(validator.curriculum) > 20, f"Expected 20+ words, got {len(validator.curriculum)}"
-    assert "可能" in validator.curriculum, "可能 should be in curriculum"
-    assert validator.curriculum["可能"] == "hsk2-l1", f"可能 should be hsk2-l1, got {validator.curriculum['可能']}"
-    
-    return TestClient(app)
-
-
-@pytest.fixture(scope="module")
-def api_key():
-    """Return the test API key"""
-    return "test-api-key-12345"
+from unittest.mock import AsyncMock, patch
 
 
 class TestHealthEndpoint:
@@ -214,23 +116,101 @@ class TestValidateEndpoint:
         assert data["valid"] is True
 
 
-class TestRequestValidation:
-    """Tests for request validation"""
+class TestValidateResponseCache:
+    """Tests for the serialized /validate response cache"""
+    
+    def test_repeat_request_served_from_cache(self, client):
+        """Identical requests should reuse the cached response bytes"""
+        from app.main import _validate_response_bytes
+        body = {"text": "你好，我喝水", "user_position": {"hsk": 1, "lesson": 2}}
+        first = client.post("/validate", json=body)
+        hits = _validate_response_bytes.cache_info().hits
+        second = client.post("/validate", json=body)
+        assert second.content == first.content
+        assert second.headers["content-type"] == "application/json"
+        assert _validate_response_bytes.cache_info().hits == hits + 1
+    
+    def test_reindex_invalidates_cached_response(self, client):
+        """Re-indexing the curriculum (load, seed) should bump the epoch so old bytes aren't served"""
+        from app.main import validator
+        epoch = validator.cache_epoch
+        validator.rebuild_index()
+        assert validator.cache_epoch > epoch
+
+
+class TestJiebaWarmup:
+    """Tests for the background jieba warmup and its handoff to requests"""
+    
+    def test_warmup_task_kept_on_app_state(self, client):
+        """The startup warmup task should be reachable (and finished) via app.state"""
+        assert client.app.state.jieba_warmup.done()
+    
+    async def test_pending_init_runs_off_event_loop(self, aclient, monkeypatch):
+        """Requests that find jieba uninitialized should build it in a worker thread"""
+        from app.main import validator
+        loop_thread = threading.current_thread()
+        init_threads = []
+        init_jieba = validator.init_jieba
+        
+        def recording_init():
+            if not validator.jieba_ready:
+                init_threads.append(threading.current_thread())
+            init_jieba()
+        
+        monkeypatch.setattr(validator, "init_jieba", recording_init)
+        monkeypatch.setattr(validator, "_pending_words", ["你好"])
+        response = await aclient.post("/validate-lesson", json={
+            "text": "你好", "lesson_number": 1, "focus_words": [], "hsk_level": 1
+        })
+        assert response.status_code == 200
+        assert validator.jieba_ready
+        assert init_threads and loop_thread not in init_threads
+
+
+class TestValidateBatchEndpoint:
+    """Tests for /validate/batch endpoint"""
     
-    def test_invalid_hsk_type(self, client):
-        """Should reject non-integer HSK"""
-        response = client.post("/validate", json={
-            "text": "你好",
-            "user_position": {"hsk": "one", "lesson": 1},
+    def test_validate_batch_returns_results_in_order(self, client):
+        """Should return one result per text, in request order"""
+        response = client.post("/validate/batch", json={
+            "texts": ["你好！谢谢！", "我可能去学习", "你好！谢谢！"],
+            "user_position": {"hsk": 1, "lesson": 1},
             "target_words": []
         })
-        assert response.status_code == 422
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["valid"] for r in results] == [True, False, True]
+        assert results[0] == results[2]
+    
+    def test_validate_batch_matches_single(self, client):
+        """Each batch result should equal the /validate result for that text"""
+        body = {"user_position": {"hsk": 1, "lesson": 3}, "target_words": ["学习"]}
+        single = client.post("/validate", json={"text": "我学习中文", **body}).json()
+        batch = client.post("/validate/batch", json={"texts": ["我学习中文"], **body}).json()
+        assert batch["results"] == [single]
+    
+    def test_validate_batch_empty(self, client):
+        """Should accept an empty batch"""
+        response = client.post("/validate/batch", json={
+            "texts": [],
+            "user_position": {"hsk": 1, "lesson": 1}
+        })
+        assert response.status_code == 200
+        assert response.json()["results"] == []
+
+
+class TestRequestValidation:
+    """Tests for request validation"""
     
-    def test_invalid_lesson_type(self, client):
-        """Should reject non-integer lesson"""
+    @pytest.mark.parametrize("user_position", [
+        {"hsk": "one", "lesson": 1},  # Non-integer HSK
+        {"hsk": 1, "lesson": "one"},  # Non-integer lesson
+    ], ids=["invalid_hsk_type", "invalid_lesson_type"])
+    def test_invalid_position_rejected(self, client, user_position):
+        """Should reject non-integer position fields"""
         response = client.post("/validate", json={
             "text": "你好",
-            "user_position": {"hsk": 1, "lesson": "one"},
+            "user_position": user_position,
             "target_words": []
         })
         assert response.status_code == 422
@@ -249,8 +229,20 @@ class TestSyncEndpoint:
         response = client.post("/sync", headers={"X-API-Key": "wrong-key"})
         assert response.status_code == 401
     
-    # Note: Skipping test_sync_accepts_valid_key because it tries to sync 
-    # from production backend and corrupts test curriculum data
+    def test_sync_accepts_valid_key(self, client, api_key):
+        """Should run sync with the right API key (backend call mocked out)"""
+        unchanged = {
+            "success": True,
+            "version": "test-v1",
+            "word_count": 0,
+            "lesson_count": 0,
+            "changed": False
+        }
+        with patch("app.main.sync.sync", AsyncMock(return_value=unchanged)) as mock_sync:
+            response = client.post("/sync", headers={"X-API-Key": api_key})
+        assert response.status_code == 200
+        assert response.json()["changed"] is False
+        mock_sync.assert_awaited_once()
 
 
 class TestHealthDetails:
@@ -355,31 +347,22 @@ class TestValidateLessonEndpoint:
 class TestValidateLessonRequestValidation:
     """Tests for request validation"""
     
-    def test_missing_text(self, client):
-        """Should error on missing text"""
-        response = client.post("/validate-lesson", json={
-            "lesson_number": 3,
-            "focus_words": [],
-            "hsk_level": 1
-        })
-        assert response.status_code == 422
-    
-    def test_missing_lesson_number(self, client):
-        """Should error on missing lesson_number"""
-        response = client.post("/validate-lesson", json={
-            "text": "你好",
-            "focus_words": [],
-            "hsk_level": 1
-        })
-        assert response.status_code == 422
-    
-    def test_missing_focus_words(self, client):
-        """Should error on missing focus_words"""
-        response = client.post("/validate-lesson", json={
-            "text": "你好",
-            "lesson_number": 3,
-            "hsk_level": 1
-        })
+    @pytest.mark.parametrize("payload", [
+        {"lesson_number": 3, "focus_words": [], "hsk_level": 1},
+        {"text": "你好", "focus_words": [], "hsk_level": 1},
+        {"text": "你好", "lesson_number": 3, "hsk_level": 1},
+        {"text": "你好", "lesson_number": "three", "focus_words": [], "hsk_level": 1},
+        {"text": "你好", "lesson_number": 3, "focus_words": [], "hsk_level": "one"},
+    ], ids=[
+        "missing_text",
+        "missing_lesson_number",
+        "missing_focus_words",
+        "invalid_lesson_number_type",
+        "invalid_hsk_level_type",
+    ])
+    def test_invalid_request_rejected(self, client, payload):
+        """Should error on missing fields and non-integer numbers"""
+        response = client.post("/validate-lesson", json=payload)
         assert response.status_code == 422
     
     def test_default_hsk_level(self, client):
@@ -390,26 +373,6 @@ class TestValidateLessonRequestValidation:
             "focus_words": []
         })
         assert response.status_code == 200
-    
-    def test_invalid_lesson_number_type(self, client):
-        """Should reject non-integer lesson_number"""
-        response = client.post("/validate-lesson", json={
-            "text": "你好",
-            "lesson_number": "three",
-            "focus_words": [],
-            "hsk_level": 1
-        })
-        assert response.status_code == 422
-    
-    def test_invalid_hsk_level_type(self, client):
-        """Should reject non-integer hsk_level"""
-        response = client.post("/validate-lesson", json={
-            "text": "你好",
-            "lesson_number": 3,
-            "focus_words": [],
-            "hsk_level": "one"
-        })
-        assert response.status_code == 422
 
 
 # ═══════════════════════════════════════════════════════════
@@ -434,14 +397,14 @@ class TestGetVocabularyEndpoint:
         assert isinstance(data["words"], list)
         assert data["count"] == len(data["words"])
     
-    def test_get_vocabulary_respects_max_lesson(self, client):
+    async def test_get_vocabulary_respects_max_lesson(self, aclient):
         """Should only return words up to max_lesson"""
-        # Get words for lesson 1 (HSK1 L1 only)
-        response1 = client.get("/get-vocabulary?max_lesson=1")
+        # Get words for lesson 1 (HSK1 L1 only) and lesson 3 (HSK1 L1-3)
+        response1, response3 = await asyncio.gather(
+            aclient.get("/get-vocabulary?max_lesson=1"),
+            aclient.get("/get-vocabulary?max_lesson=3"),
+        )
         data1 = response1.json()
-        
-        # Get words for lesson 3 (HSK1 L1-3)
-        response3 = client.get("/get-vocabulary?max_lesson=3")
         data3 = response3.json()
         
         # Lesson 3 should have more words than lesson 1
@@ -545,25 +508,28 @@ class TestValidateLessonIntegration:
         data2 = response2.json()
         assert data2["valid"] is True
     
-    def test_hsk_progression(self, client):
+    async def test_hsk_progression(self, aclient):
         """Test that HSK level affects what's valid"""
         text = "我可能学习"  # 可能 is HSK2 L1
         
-        # At HSK1 L3 - should fail (可能 is too advanced)
-        response1 = client.post("/validate-lesson", json={
-            "text": text,
-            "lesson_number": 3,
-            "focus_words": ["学习"],
-            "hsk_level": 1
-        })
-        assert response1.json()["valid"] is False
-        
-        # At HSK2 L1 - should pass (可能 is current lesson focus)
-        response2 = client.post("/validate-lesson", json={
-            "text": text,
-            "lesson_number": 1,
-            "focus_words": ["可能"],
-            "hsk_level": 2
-        })
-        assert response2.json()["valid"] is True
+        response1, response2 = await asyncio.gather(
+            # At HSK1 L3 - should fail (可能 is too advanced)
+            aclient.post("/validate-lesson", json={
+                "text": text,
+                "lesson_number": 3,
+                "focus_words": ["学习"],
+                "hsk_level": 1
+            }),
+            # At HSK2 L1 - should pass (可能 is current lesson focus)
+            aclient.post("/validate-lesson", json={
+                "text": text,
+                "lesson_number": 1,
+                "focus_words": ["可能"],
+                "hsk_level": 2
+            }),
+        )
+        data1 = response1.json()
+        data2 = response2.json()
+        assert data1["valid"] is False
+        assert data2["valid"] is True
 
@@ -5,15 +5,16 @@ Tests for the Content Recommender
 import pytest
 import json
 import os
+from types import SimpleNamespace
 from app.recommender import ContentRecommender
-from app.models import TierName, TIER_CONFIG
+from app.models import TierName, TierResult, TIER_CONFIG
 
 
 # ═══════════════════════════════════════════════════════════
 # Fixtures
 # ═══════════════════════════════════════════════════════════
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_content_data():
     """Sample content data for testing (pre-tokenized by backend)"""
     return {
@@ -106,15 +107,39 @@ def sample_content_data():
     }
 
 
-@pytest.fixture
-def recommender_with_data(tmp_path, sample_content_data):
-    """Create a recommender with test data"""
+@pytest.fixture(scope="session")
+def recommender_with_data(tmp_path_factory, sample_content_data):
+    """Create a recommender with test data (loaded once; tests only read from it)"""
     # Write content to temp file
-    content_path = tmp_path / "content.json"
+    data_dir = tmp_path_factory.mktemp("content")
+    content_path = data_dir / "content.json"
     with open(content_path, "w", encoding="utf-8") as f:
         json.dump(sample_content_data, f, ensure_ascii=False)
     
-    recommender = ContentRecommender(data_dir=str(tmp_path))
+    recommender = ContentRecommender(data_dir=str(data_dir))
+    recommender.load()
+    return recommender
+
+
+@pytest.fixture(scope="session")
+def empty_recommender(tmp_path_factory):
+    """Create a recommender loaded from an export with no content"""
+    data = {
+        "version": "test",
+        "exportedAt": "2025-11-26T10:00:00Z",
+        "vocabulary": [],
+        "lessons": [],
+        "lessonOrder": [],
+        "lessonWordMap": {},
+        "stories": [],
+        "audiobooks": [],
+    }
+    
+    data_dir = tmp_path_factory.mktemp("empty_content")
+    with open(data_dir / "content.json", "w") as f:
+        json.dump(data, f)
+    
+    recommender = ContentRecommender(data_dir=str(data_dir))
     recommender.load()
     return recommender
 
@@ -151,6 +176,14 @@ class TestRecommenderSetup:
         assert len(rec.cumulative_words["lesson-5"]) == 10
     
     
+    def test_known_word_sets_are_immutable(self, recommender_with_data):
+        """Known-word sets are shared across calls, so they must be frozen"""
+        rec = recommender_with_data
+        
+        assert isinstance(rec.get_known_words_for_lesson("lesson-2"), frozenset)
+        assert isinstance(rec.get_known_words_for_lesson("unknown-lesson"), frozenset)
+        assert rec.cumulative_words["lesson-1"] < rec.cumulative_words["lesson-2"]
+    
     def test_get_info(self, recommender_with_data):
         """Test get_info returns correct structure"""
         info = recommender_with_data.get_info()
@@ -181,7 +214,7 @@ class TestComprehensionCalculation:
             {"wordId": "v5", "hanzi": "是"},
             {"wordId": "v6", "hanzi": "学生"},
         ]
-        comp, unknown, count = rec._calculate_comprehension(tokens, known)
+        comp, unknown, count = rec._score_item(rec._index_tokens(tokens), known)
         
         # Should be 100% comprehension
         assert comp == 1.0
@@ -199,7 +232,7 @@ class TestComprehensionCalculation:
             {"wordId": "v5", "hanzi": "是"},
             {"wordId": "v7", "hanzi": "老师"},
         ]
-        comp, unknown, count = rec._calculate_comprehension(tokens, known)
+        comp, unknown, count = rec._score_item(rec._index_tokens(tokens), known)
         
         # 老师 is unknown - 2/3 known = 66.7%
         assert comp < 1.0
@@ -210,7 +243,7 @@ class TestComprehensionCalculation:
         rec = recommender_with_data
         known = rec.get_known_words_for_lesson("lesson-1")
         
-        comp, unknown, count = rec._calculate_comprehension([], known)
+        comp, unknown, count = rec._score_item(rec._index_tokens([]), known)
         
         assert comp == 1.0
         assert count == 0
@@ -225,11 +258,28 @@ class TestComprehensionCalculation:
             {"wordId": None, "hanzi": "去"},  # Not in curriculum
             {"wordId": "v5", "hanzi": "是"},
         ]
-        comp, unknown, count = rec._calculate_comprehension(tokens, known)
+        comp, unknown, count = rec._score_item(rec._index_tokens(tokens), known)
         
         # Only v4 and v5 counted (both known) - 2/2 = 100%
         assert comp == 1.0
         assert count == 0
+    
+    def test_object_tokens(self, recommender_with_data):
+        """Tokens given as objects should index like the equivalent dicts"""
+        rec = recommender_with_data
+        known = rec.get_known_words_for_lesson("lesson-2")
+        
+        tokens = [
+            {"wordId": "v4", "hanzi": "我"},
+            {"wordId": "v7", "hanzi": "老师"},
+            {"wordId": None, "hanzi": "去"},
+        ]
+        objects = [SimpleNamespace(**t) for t in tokens]
+        
+        assert rec._index_tokens(objects) == rec._index_tokens(tokens)
+        assert rec._score_item(rec._index_tokens(objects), known) == (
+            0.5, [{"wordId": "v7", "hanzi": "老师"}], 1
+        )
 
 
 # ═══════════════════════════════════════════════════════════
@@ -253,12 +303,10 @@ class TestRecommendations:
         
         result = rec.recommend(lesson_id="lesson-3")
         
-        for tier_name, tier in result.tiers.items():
-            assert hasattr(tier, "label")
-            assert hasattr(tier, "description")
-            assert hasattr(tier, "emoji")
-            assert hasattr(tier, "range")
-            assert hasattr(tier, "items")
+        expected = {"label", "description", "emoji", "range", "items"}
+        for tier in result.tiers.values():
+            assert isinstance(tier, TierResult)
+        assert expected <= TierResult.model_fields.keys()
     
     def test_recommend_content_type_filter(self, recommender_with_data):
         """Test filtering by content type"""
@@ -310,23 +358,16 @@ class TestRecommendations:
 # ═══════════════════════════════════════════════════════════
 
 class TestTierThresholds:
-    def test_comfort_tier_threshold(self):
-        """Test comfort tier is 95-100%"""
-        config = TIER_CONFIG[TierName.COMFORT]
-        assert config["min"] == 0.95
-        assert config["max"] == 1.00
-    
-    def test_challenge_tier_threshold(self):
-        """Test challenge tier is 85-95%"""
-        config = TIER_CONFIG[TierName.CHALLENGE]
-        assert config["min"] == 0.85
-        assert config["max"] == 0.95
-    
-    def test_stretch_tier_threshold(self):
-        """Test stretch tier is 75-85%"""
-        config = TIER_CONFIG[TierName.STRETCH]
-        assert config["min"] == 0.75
-        assert config["max"] == 0.85
+    @pytest.mark.parametrize("tier,lo,hi", [
+        (TierName.COMFORT, 0.95, 1.00),
+        (TierName.CHALLENGE, 0.85, 0.95),
+        (TierName.STRETCH, 0.75, 0.85),
+    ], ids=["comfort", "challenge", "stretch"])
+    def test_tier_threshold(self, tier, lo, hi):
+        """Test comfort 95-100%, challenge 85-95%, stretch 75-85%"""
+        config = TIER_CONFIG[tier]
+        assert config["min"] == lo
+        assert config["max"] == hi
 
 
 # ═══════════════════════════════════════════════════════════
@@ -342,29 +383,10 @@ class TestEdgeCases:
         known = rec.get_known_words_for_lesson("unknown-lesson")
         assert len(known) == 0
     
-    def test_recommend_with_no_content(self, tmp_path):
+    def test_recommend_with_no_content(self, empty_recommender):
         """Test recommender with no stories"""
-        data = {
-            "version": "test",
-            "exportedAt": "2025-11-26T10:00:00Z",
-            "vocabulary": [],
-            "lessons": [],
-            "lessonOrder": [],
-            "lessonWordMap": {},
-            "stories": [],
-            "audiobooks": [],
-        }
-        
-        content_path = tmp_path / "content.json"
-        with open(content_path, "w") as f:
-            json.dump(data, f)
-        
-        rec = ContentRecommender(data_dir=str(tmp_path))
-        rec.load()
-        
-        result = rec.recommend(lesson_id="any")
+        result = empty_recommender.recommend(lesson_id="any")
         
         # Should return empty tiers
         for tier in result.tiers.values():
             assert len(tier.items) == 0
-
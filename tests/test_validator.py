@@ -4,8 +4,19 @@ Unit tests for VocabValidator
 Tests the core validation logic without network calls.
 """
 
+import json
+import os
+import threading
+
 import pytest
-from app.validator import VocabValidator
+from app import validator as validator_module
+from app.validator import VocabValidator, _segment, jieba
+
+
+def _bump_version(validator, version="test-v2"):
+    """Simulate a sync that wrote a new curriculum version"""
+    with open(os.path.join(validator.data_dir, "version.txt"), "w") as f:
+        f.write(version)
 
 
 class TestValidatorSetup:
@@ -24,6 +35,107 @@ class TestValidatorSetup:
         assert info["word_count"] == 15  # Number of words in mock
         assert info["version"] == "test-v1"
     
+    def test_absolute_lesson_index(self, validator):
+        """Should precompute absolute lesson IDs at load"""
+        assert validator.curriculum_abs["你好"] == 1   # hsk1-l1
+        assert validator.curriculum_abs["学习"] == 3   # hsk1-l3
+        assert validator.curriculum_abs["可能"] == 11  # hsk2-l1
+        assert len(validator.curriculum_abs) == len(validator.curriculum)
+    
+    def test_position_index(self, validator):
+        """Should precompute (hsk, lesson) positions at load"""
+        assert validator.curriculum_pos["你好"] == (1, 1)
+        assert validator.curriculum_pos["虽然"] == (2, 2)
+        assert validator.curriculum_pos.keys() == validator.curriculum.keys()
+    
+    def test_known_words_index(self, validator):
+        """Should precompute curriculum + always-safe words as one frozenset"""
+        assert isinstance(validator.known_words, frozenset)
+        assert validator.known_words >= validator.curriculum.keys()
+        assert validator.known_words >= validator.always_safe
+    
+    def test_reload_skips_registered_jieba_words(self, validator, monkeypatch):
+        """Reload should not re-add words jieba already knows"""
+        validator.init_jieba()
+        added = []
+        monkeypatch.setattr("app.validator.jieba.add_word", lambda word, *a, **kw: added.append(word))
+        _bump_version(validator)
+        validator.reload()
+        validator.init_jieba()
+        assert added == []
+    
+    def test_jieba_words_added_on_first_use(self, temp_data_dir, monkeypatch):
+        """Load should defer jieba registration until text is segmented"""
+        added = []
+        monkeypatch.setattr("app.validator.jieba.add_word", lambda word, *a, **kw: added.append(word))
+        monkeypatch.setattr("app.validator._jieba_words", set())
+        v = VocabValidator(data_dir=temp_data_dir)
+        v.load()
+        assert added == []
+        v.validate("你好", 1, 1)
+        assert set(added) == v.curriculum.keys()
+    
+    def test_register_words_clears_pending(self, temp_data_dir, monkeypatch):
+        """Explicitly registered words shouldn't be re-added on first use"""
+        monkeypatch.setattr("app.validator._jieba_words", set())
+        v = VocabValidator(data_dir=temp_data_dir)
+        v.load()
+        v.register_words(v.curriculum, freq=1000)
+        assert v._pending_words == []
+    
+    def test_reload_during_jieba_init_keeps_new_words(self, temp_data_dir, monkeypatch):
+        """A reload racing the jieba warmup must not lose the new curriculum's words"""
+        monkeypatch.setattr("app.validator._jieba_words", set())
+        v = VocabValidator(data_dir=temp_data_dir)
+        v.load()
+        
+        started = threading.Event()
+        release = threading.Event()
+        add_word = jieba.add_word
+        
+        def slow_add_word(word, *args, **kwargs):
+            started.set()
+            release.wait(5)
+            add_word(word, *args, **kwargs)
+        
+        monkeypatch.setattr("app.validator.jieba.add_word", slow_add_word)
+        warmup = threading.Thread(target=v.init_jieba)
+        warmup.start()
+        assert started.wait(5)
+        
+        curriculum_path = os.path.join(temp_data_dir, "curriculum.json")
+        with open(curriculum_path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["words"]["图书馆员"] = "hsk2-l3"
+        with open(curriculum_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        _bump_version(v)
+        reload = threading.Thread(target=v.reload)
+        reload.start()
+        release.set()
+        warmup.join(5)
+        reload.join(5)
+        
+        assert "图书馆员" in v._pending_words
+        assert not v.jieba_ready
+        v.init_jieba()
+        assert v.jieba_ready
+        assert "图书馆员" in validator_module._jieba_words
+    
+    def test_reload_same_version_is_noop(self, validator):
+        """Reload should skip all work while version.txt is unchanged"""
+        validator.validate("你好", 1, 1)
+        epoch = validator.cache_epoch
+        validator.reload()
+        assert validator.cache_epoch == epoch
+        assert validator._learning_words_cached.cache_info().currsize == 1
+    
+    def test_reload_new_version_reparses(self, validator):
+        """Reload should pick up a new curriculum version"""
+        _bump_version(validator)
+        validator.reload()
+        assert validator.version == "test-v2"
+    
     def test_missing_curriculum_raises(self):
         """Should raise error if curriculum doesn't exist"""
         v = VocabValidator(data_dir="/nonexistent/path")
@@ -91,6 +203,15 @@ class TestWordSafety:
     def test_unknown_word_not_safe(self, validator):
         """Words not in curriculum should not be safe"""
         assert validator._is_word_safe("随便", 1, 1) is False
+    
+    def test_out_of_range_lesson_keeps_hsk_order(self, validator):
+        """Large or negative lesson numbers must not cross HSK levels"""
+        assert validator._is_word_safe("可能", 1, 1500) is False
+        assert validator._is_word_safe("你好", 2, -1500) is True
+        
+        result = validator.validate("我可能学习", user_hsk=1, user_lesson=1500)
+        assert result["valid"] is False
+        assert "可能" in result["forbidden_words"]
 
 
 class TestTargetWord:
@@ -451,6 +572,29 @@ class TestValidateLessonSuggestions:
         assert "学习" in result["suggestion"]
 
 
+class TestOccurrenceOrder:
+    """Per-occurrence results should follow the text"""
+    
+    def test_invalid_words_in_text_order(self, validator):
+        """Invalid words and the suggestion list each occurrence in text order"""
+        result = validator.validate_lesson(
+            text="可能你好需要可能",
+            lesson_number=3,
+            focus_words=[],
+            hsk_level=1
+        )
+        assert [w["word"] for w in result["invalid_words"]] == ["可能", "需要", "可能"]
+        assert result["suggestion"].endswith("可能, 需要, 可能")
+    
+    def test_pedagogy_issues_in_text_order(self, validator):
+        """Pedagogy issues list each too-advanced occurrence in text order"""
+        result = validator.validate_pedagogy("可能你好需要可能", [], 3, 1, [])
+        issues = result["items"][0]["issues"]
+        assert [issue.split("'")[1] for issue in issues if issue.startswith("Word")] == [
+            "可能", "需要", "可能"
+        ]
+
+
 class TestValidateLessonStats:
     """Tests for statistics calculation"""
     
@@ -515,3 +659,206 @@ class TestValidateLessonEdgeCases:
         for word in result.get("invalid_words", []):
             assert word["word"] != "！"
 
+
+class TestValidateCache:
+    """Tests for repeated validate calls (segmentation is memoized per text)"""
+    
+    def test_repeat_call_reuses_segmentation(self, validator):
+        """Identical calls (in any target word order) should give equal results"""
+        first = validator.validate("你好学习工作", 1, 3, ["学习", "工作"])
+        second = validator.validate("你好学习工作", 1, 3, ["工作", "学习"])
+        assert first == second
+        assert validator._learning_words_cached.cache_info().hits == 1
+    
+    def test_cached_result_not_mutated(self, validator):
+        """Mutating a returned result should not corrupt later calls"""
+        result = validator.validate("你好可能", 1, 1)
+        result["forbidden_words"].clear()
+        result["words_found"].clear()
+        again = validator.validate("你好可能", 1, 1)
+        assert again["forbidden_words"] == ["可能"]
+        assert again["words_found"] == ["你好", "可能"]
+    
+    def test_reload_clears_cache(self, validator):
+        """Reloading the curriculum should invalidate cached segmentations"""
+        validator.validate("你好", 1, 1)
+        _bump_version(validator)
+        validator.reload()
+        assert validator._learning_words_cached.cache_info().currsize == 0
+
+
+class TestValidateLessonCache:
+    """Tests for repeated validate_lesson calls"""
+    
+    def test_repeat_call_reuses_segmentation(self, validator):
+        """Identical calls should give equal results from one segmentation"""
+        args = dict(text="你好学习", lesson_number=3, focus_words=["学习"], hsk_level=1)
+        first = validator.validate_lesson(**args)
+        second = validator.validate_lesson(**args)
+        assert first == second
+        assert _segment.cache_info().hits == 1
+    
+    def test_cached_result_not_mutated(self, validator):
+        """Mutating a returned result should not corrupt later calls"""
+        result = validator.validate_lesson("你好可能", 3, [], 1)
+        result["invalid_words"].clear()
+        again = validator.validate_lesson("你好可能", 3, [], 1)
+        assert len(again["invalid_words"]) > 0
+    
+    def test_reload_clears_cache(self, validator):
+        """Reloading the curriculum should invalidate cached results"""
+        validator.validate_lesson("你好", 3, [], 1)
+        _bump_version(validator)
+        validator.reload()
+        assert validator._classify_words_cached.cache_info().currsize == 0
+        assert validator._learning_words_cached.cache_info().currsize == 0
+        assert _segment.cache_info().currsize == 0
+
+
+class TestClassificationCache:
+    """Tests for the classification cache shared by reading and pedagogy"""
+    
+    def test_reading_and_pedagogy_share_classification(self, validator):
+        """Validating the same reading twice should classify its words once"""
+        validator.validate_reading_structured("我学习可能", 3, 1, ["学习"])
+        validator.validate_pedagogy("我学习可能", [], 3, 1, ["学习"])
+        assert validator._classify_words_cached.cache_info().hits == 1
+    
+    def test_learning_split_text_not_shared(self, validator):
+        """Reading classifies raw tokens, so a text the learning split changes misses"""
+        assert validator._extract_chinese_words("我要学习") != list(_segment("我要学习", 0))
+        validator.validate_reading_structured("我要学习", 3, 1, ["学习"])
+        validator.validate_pedagogy("我要学习", [], 3, 1, ["学习"])
+        info = validator._classify_words_cached.cache_info()
+        assert (info.hits, info.misses) == (0, 2)
+
+
+class TestSummaryOnly:
+    """Tests for the summary_only fast path"""
+    
+    def test_validate_summary_matches_full(self, validator):
+        """Summary should carry the same verdict and stats, without word lists"""
+        full = validator.validate("你好可能随便", 1, 1)
+        summary = validator.validate("你好可能随便", 1, 1, summary_only=True)
+        assert summary == {"valid": full["valid"], "stats": full["stats"]}
+    
+    def test_validate_lesson_summary_matches_full(self, validator):
+        """Summary should count invalid occurrences without building entries"""
+        full = validator.validate_lesson("可能可能你好", 3, [], 1)
+        summary = validator.validate_lesson("可能可能你好", 3, [], 1, summary_only=True)
+        assert summary == {"valid": full["valid"], "stats": full["stats"]}
+        assert summary["stats"]["invalid_count"] == 2
+    
+    def test_reading_summary_matches_full(self, validator):
+        """Summary should keep only the verdict fields"""
+        full = validator.validate_reading_structured("我学习可能", 3, 1, ["学习"])
+        summary = validator.validate_reading_structured(
+            "我学习可能", 3, 1, ["学习"], summary_only=True
+        )
+        assert summary == {k: full[k] for k in ("ok", "unknown_ratio", "too_hard", "too_easy")}
+
+
+class TestSegmentation:
+    """Tests for the shared jieba segmentation cache"""
+    
+    def test_segment_filters_punctuation(self, validator):
+        """Punctuation and whitespace tokens should be dropped"""
+        assert _segment("你好！ 谢谢。", 0) == ("你好", "谢谢")
+    
+    def test_segment_filters_curly_quotes(self, validator):
+        """Chinese quotation marks should be treated as punctuation"""
+        assert "“" not in _segment("“你好”", 0)
+        assert validator._is_punctuation("‘’") is True
+    
+    def test_segment_filters_unicode_punctuation(self, validator):
+        """Punctuation outside the hardcoded set (corner brackets, ideographic space) is dropped"""
+        assert _segment("「你好」\u3000『谢谢』", 0) == ("你好", "谢谢")
+        assert validator._is_punctuation("〔〕") is True
+        assert validator._is_punctuation("你") is False
+    
+    def test_trivial_text_skips_jieba(self, validator, monkeypatch):
+        """Punctuation-only and single-character texts shouldn't reach jieba"""
+        def fail(*args, **kwargs):
+            raise AssertionError("jieba.cut called")
+        monkeypatch.setattr("app.validator.jieba.cut", fail)
+        _segment.cache_clear()
+        assert _segment("", 0) == ()
+        assert _segment("！？ 。", 0) == ()
+        assert _segment("“我！”", 0) == ("我",)
+    
+    def test_long_text_goes_straight_to_jieba(self, validator, monkeypatch):
+        """Texts past the trivial-length bound skip the strip pass but segment the same"""
+        from app.validator import jieba
+        cut = jieba.cut
+        calls = []
+        
+        def recording_cut(text, *args, **kwargs):
+            calls.append(text)
+            return cut(text, *args, **kwargs)
+        
+        monkeypatch.setattr("app.validator.jieba.cut", recording_cut)
+        _segment.cache_clear()
+        assert _segment("！？。，！？。，我！", 0) == ("我",)
+        assert calls == ["！？。，！？。，我！"]
+    
+    def test_cuts_run_concurrently(self, validator):
+        """A cut in progress shouldn't block another thread's cut"""
+        with validator_module._jieba_lock.reading():
+            worker = threading.Thread(target=_segment, args=("你好谢谢学习", -1))
+            worker.start()
+            worker.join(5)
+            assert not worker.is_alive()
+    
+    def test_dictionary_write_waits_for_cuts(self, validator, monkeypatch):
+        """Adding words must wait until in-progress cuts finish"""
+        monkeypatch.setattr("app.validator.jieba.add_word", lambda word, *a, **kw: None)
+        with validator_module._jieba_lock.reading():
+            writer = threading.Thread(target=validator_module._add_jieba_words, args=(["你好"],))
+            writer.start()
+            writer.join(0.1)
+            assert writer.is_alive()
+        writer.join(5)
+        assert not writer.is_alive()
+    
+    def test_segment_is_cached(self, validator):
+        """Repeated text should be served from the cache"""
+        _segment("你好谢谢", 0)
+        hits = _segment.cache_info().hits
+        _segment("你好谢谢", 0)
+        assert _segment.cache_info().hits == hits + 1
+    
+    def test_register_words_bumps_segment_generation(self, validator):
+        """Adding words to jieba must make earlier cuts unreachable"""
+        from app import validator as validator_module
+        generation = validator_module._jieba_generation
+        validator.register_words(["你好谢谢"])
+        assert validator_module._jieba_generation == generation + 1
+    
+    def test_stale_epoch_entry_not_served(self, validator):
+        """A result computed under an old cache_epoch must not be served after a reload"""
+        epoch = validator.cache_epoch
+        validator._learning_words_cached("我要学习", epoch)
+        validator.clear_caches()
+        # A worker that read the old epoch finishes after the clear
+        validator._learning_words_cached("我要学习", epoch)
+        validator.validate("我要学习", 1, 1)
+        info = validator._learning_words_cached.cache_info()
+        assert info.hits == 0
+        assert info.currsize == 2
+    
+    def test_learning_split_shared_across_positions(self, validator):
+        """Different user positions should reuse one segmentation of the text"""
+        validator.validate("我要学习", 1, 1)
+        validator.validate("我要学习", 2, 5)
+        info = validator._learning_words_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+    
+    def test_exercise_fields_segmented_separately(self, validator):
+        """Each exercise field is segmented on its own, never joined"""
+        ex = {
+            "question": {"chinese": "你好"},
+            "options": [{"chinese": "谢谢"}, {"chinese": "我"}]
+        }
+        assert validator._extract_exercise_chinese(ex, "multiple_choice") == [
+            ["你好"], ["谢谢"], ["我"]
+        ]